@@ -1,17 +1,26 @@
+import gc
+import logging
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from flask import Flask, request, jsonify, send_file, send_from_directory
+from flask import Flask, Response, g, has_app_context, request, jsonify, send_file, send_from_directory, stream_with_context
 from flask_cors import CORS
 import json
 import datetime
 import random
-from match_me import INTEREST_MAPPINGS, COURSE_MAPPINGS, INTEREST_DESCRIPTIONS, enhanced_interest_score, enhanced_course_score
-from chanceMe import predict_admission_chance
+import match_engine
+import metrics
+from metrics import logger, stage
+from caches import LRUCache
+from pdf_jobs import PDFJobs, is_job_id
+from mentors import seeded_rng
+from data_registry import DataRegistry
+from chanceMe import predict_admission_chance, predict_admission_chance_batch, render_admission_result
 
 app = Flask(__name__)
 CORS(app, origins=["http://localhost:3000"])
+metrics.instrument_app(app)
 
 app.static_folder = 'static'
 
@@ -19,184 +28,201 @@ app.static_folder = 'static'
 def serve_static(filename):
     return send_from_directory(app.static_folder, filename)
 
-# Fix the file path here - change from 'backend/program_profiles.json' to just 'program_profiles.json'
-file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'program_profiles.json')
-with open(file_path, 'r', encoding='utf-8') as f:
-    programs = json.load(f)
-
-def compute_matches(answers, num_results=10):
-    # Unpack answers from frontend (make sure keys match your frontend)
-    wa = float(answers.get("wa", 1))
-    wc = float(answers.get("wc", 1))
-    wso = float(answers.get("wso", 1))
-    W_TOTAL = wa + wc + wso
-
-    AA = answers.get("AA", [])
-    LS = int(answers.get("LS", 3))
-    SP = int(answers.get("SP", 3))
-    CO = int(answers.get("CO", 3))
-    UR = int(answers.get("UR", 3))
-    CR = int(answers.get("CR", 3))
-    CE = int(answers.get("CE", 3))
-    LC = answers.get("LC", [])
-    ME = int(answers.get("ME", 3))
-    CP = int(answers.get("CP", 3))
-    ALT = answers.get("ALT", [])
-    CSB = answers.get("CSB", "")
-    SET = answers.get("SET", "")
-    HS = set(answers.get("HS", []))
-    CPS = answers.get("CPS", "")
-    NS = int(answers.get("NS", 3))
-    SPT = set(answers.get("SPT", []))
-    CLB = set(answers.get("CLB", []))
-    CEV = int(answers.get("CEV", 3))
-
-    def score_academic(p):
-        prog_int = p['academic']['interests']
-        i_score = enhanced_interest_score(AA, prog_int) * 0.4
-        prog_lc = p['academic'].get('liked_hs_courses', [])
-        lc_score = enhanced_course_score(LC, prog_lc) * 0.2
-        prog_alt = set(p['academic'].get('alt_to_engineering', []))
-        alt_score = 0
-        if ALT:
-            matched_alts = prog_alt.intersection(set(ALT))
-            alt_score = (len(matched_alts) / max(len(ALT), 1)) * 0.1
-        keys = ['learning_style', 'first_year_specialization', 'coop_importance', 
-                'research_importance', 'creativity_orientation', 'career_certainty', 
-                'math_enjoyment', 'collaboration_preference']
-        vals = [LS, SP, CO, UR, CR, CE, ME, CP]
-        weights = {
-            'learning_style': 1.2,
-            'first_year_specialization': 1.0,
-            'coop_importance': 1.5 if CO >= 4 else 1.0,
-            'research_importance': 1.5 if UR >= 4 else 1.0,
-            'creativity_orientation': 1.2 if CR >= 4 else 1.0,
-            'career_certainty': 1.0,
-            'math_enjoyment': 1.3,
-            'collaboration_preference': 1.0
-        }
-        total_weight = sum(weights.values())
-        num_scores = []
-        for k, s in zip(keys, vals):
-            prog_val = p['academic'].get(k, 3)
-            similarity = 1 - (abs(prog_val - s) / 4.0)
-            weight = weights[k]
-            num_scores.append(similarity * weight)
-        num_score = sum(num_scores) / total_weight * 0.3
-        return i_score + lc_score + num_score + alt_score
-
-    def score_campus(p):
-        base = p['campus']
-        scores = []
-        if base.get('class_size_bin') == CSB:
-            scores.append(1.0)
-        else:
-            if CSB == "< 60" and base.get('class_size_bin') == "60-200":
-                scores.append(0.5)
-            elif CSB == "200+" and base.get('class_size_bin') == "60-200":
-                scores.append(0.5)
-            else:
-                scores.append(0.0)
-        if base.get('setting') == SET:
-            scores.append(1.0)
-        else:
-            urban_suburban = {"Urban", "Suburban"}
-            rural_small = {"Small-town", "Rural"}
-            if SET in urban_suburban and base.get('setting') in urban_suburban:
-                scores.append(0.5)
-            elif SET in rural_small and base.get('setting') in rural_small:
-                scores.append(0.5)
-            else:
-                scores.append(0.0)
-        hs_prog = set(base.get('housing_styles', []))
-        if hs_prog:
-            housing_score = len(HS.intersection(hs_prog)) / len(HS) if HS else 0
-            scores.append(housing_score)
-        else:
-            scores.append(0.0)
-        if base.get('campus_size') == CPS:
-            scores.append(1.0)
-        else:
-            sizes = ["Small", "Medium", "Large"]
-            user_idx = sizes.index(CPS) if CPS in sizes else -1
-            prog_idx = sizes.index(base.get('campus_size')) if base.get('campus_size') in sizes else -1
-            if user_idx != -1 and prog_idx != -1:
-                scores.append(0.5 if abs(user_idx - prog_idx) == 1 else 0.0)
-            else:
-                scores.append(0.0)
-        return sum(scores) / len(scores)
-
-    def score_social(p):
-        base = p['social']
-        prog_ns = base.get('night_scene', 3)
-        ns_score = 1 - (abs(prog_ns - NS) / 4.0)
-        sp_prog = set(base.get('sports', []))
-        if "None" in SPT:
-            spt_score = 1.0
-        else:
-            spt_score = len(sp_prog.intersection(SPT)) / max(len(SPT), 1)
-        cl_prog = set(base.get('clubs', []))
-        cl_score = len(cl_prog.intersection(CLB)) / max(len(CLB), 1) if CLB else 0.5
-        prog_cev = base.get('cultural_event_freq', 3)
-        cev_score = 1 - (abs(prog_cev - CEV) / 4.0)
-        return (ns_score + spt_score + cl_score + cev_score) / 4
-
-    results = []
-    for p in programs:
-        a = score_academic(p)
-        c = score_campus(p)
-        s = score_social(p)
-        total = (wa*a + wc*c + wso*s) / W_TOTAL
-        results.append({
-            "school": p['uni'],
-            "program": p['program'],
-            "overall": total,
-            "academic": a,
-            "campus": c,
-            "social": s
-        })
-    results.sort(key=lambda x: x["overall"], reverse=True)
-    return results[:num_results]
+# program_profiles.json, mentors.json and admissionsData.csv, loaded together
+# as one versioned snapshot and rebuilt in the background when they change
+data_registry = DataRegistry()
+
+# Scored rankings keyed by normalized answers; /api/match and /api/full-matches
+# share entries since the cached scores cover every program
+RANKING_CACHE_SIZE = 256
+ranking_cache = LRUCache(RANKING_CACHE_SIZE)
+metrics.caches.register("ranking", ranking_cache)
+
+# Academic/campus/social vectors keyed by the answers minus the weights, so
+# moving the weight sliders only re-weighs them (see /api/rerank). The key
+# doubles as the ranking handle ("ranking_id") handed to clients
+COMPONENT_CACHE_SIZE = 256
+component_cache = LRUCache(COMPONENT_CACHE_SIZE)
+metrics.caches.register("components", component_cache)
+
+def drop_stale_rankings(old, new):
+    """Cached scores belong to one program matrix; free them once it is replaced."""
+    if old is not None and old.programs is not new.programs:
+        ranking_cache.clear()
+        component_cache.clear()
+
+data_registry.on_swap(drop_stale_rankings)
+data_registry.load()
+
+def current_data():
+    """
+    The data snapshot for this request, taken once so every lookup in the
+    request agrees even if a reload lands halfway through it. Outside a
+    request (scripts, benchmarks) it is simply the current snapshot.
+    """
+    if not has_app_context():
+        return data_registry.current
+    if 'data' not in g:
+        g.data = data_registry.current
+    return g.data
+
+def current_admissions():
+    """This request's admissions data; chance-me fails with a clear error while the CSV is missing."""
+    admissions = current_data().admissions
+    if admissions is None:
+        raise FileNotFoundError(f"Admissions data not found: {data_registry.files['admissions']}")
+    return admissions
+
+@app.before_request
+def watch_data_files():
+    # Started lazily so each gunicorn worker runs its own watcher after fork
+    data_registry.ensure_watching()
+
+@app.after_request
+def add_data_version(response):
+    response.headers['X-Data-Version'] = current_data().version
+    return response
+
+def ranking(answers):
+    """
+    (matrix, scores, ranking_id) for quiz answers. Scores come from the
+    ranking cache when these exact answers were seen; otherwise the cached
+    component vectors are re-weighed, and only new answers are scored.
+    """
+    matrix = current_data().programs
+    with stage("parse"):
+        normalized = match_engine.normalize_answers(answers)
+        key = (matrix.version, match_engine.answers_key(normalized))
+        ranking_id = match_engine.components_key(normalized)
+
+    scores = ranking_cache.get(key)
+    if scores is None:
+        components = component_cache.get((matrix.version, ranking_id))
+        if components is None:
+            with stage("score"):
+                components = match_engine.component_scores(matrix, normalized)
+            component_cache.put((matrix.version, ranking_id), components)
+        with stage("weigh"):
+            scores = match_engine.weigh_components(components, normalized)
+        ranking_cache.put(key, scores)
+    return matrix, scores, ranking_id
+
+def compute_matches(answers, num_results=10, offset=0):
+    matrix, scores, _ = ranking(answers)
+    with stage("sort"):
+        return match_engine.top_matches(matrix, scores, num_results, offset)
 
 @app.route('/api/match', methods=['POST'])
 def match_api():
     try:
-        print("Request received!")  # Debug print
         data = request.json
-        print("Received data:", data)  # Debug print
+        metrics.debug_sampled("Match request: %s", data)
         matches = compute_matches(data)
-        return jsonify(matches)
+        with stage("serialize"):
+            return jsonify(matches)
     except Exception as e:
-        print("Error:", str(e))
+        logger.error("Match error: %s", e)
         return jsonify({"error": str(e)}), 500
 
+# Most answer sets accepted by one /api/match/batch request
+MAX_MATCH_BATCH = 1000
+
+@app.route('/api/match/batch', methods=['POST'])
+def match_batch_api():
+    """
+    Top matches for a whole class at once: {"answers": [...], "top_k": 10}.
+    All valid answer sets are scored together in one (students × programs)
+    pass; an invalid one gets an error entry instead of failing the batch.
+    """
+    try:
+        data = request.json
+        answers_list = data.get('answers', [])
+        top_k = int(data.get('top_k', 10))
+
+        if not isinstance(answers_list, list) or not all(isinstance(a, dict) for a in answers_list):
+            return jsonify({"success": False, "error": "answers must be a list of objects"}), 400
+        if len(answers_list) > MAX_MATCH_BATCH:
+            return jsonify({"success": False, "error": f"at most {MAX_MATCH_BATCH} answer sets per request"}), 400
+        metrics.debug_sampled("Match batch request: %d answer sets", len(answers_list))
+
+        matrix = current_data().programs
+        results = [None] * len(answers_list)
+        valid = []
+        with stage("parse"):
+            for i, answers in enumerate(answers_list):
+                try:
+                    normalized = match_engine.normalize_answers(answers)
+                    if normalized['W_TOTAL'] == 0:
+                        raise ValueError("at least one of wa, wc, wso must be non-zero")
+                except (TypeError, ValueError) as e:
+                    results[i] = {"index": i, "error": str(e)}
+                    continue
+                valid.append((i, normalized))
+
+        with stage("score"):
+            total, a, c, s = match_engine.score_programs_batch(matrix, [normalized for _, normalized in valid])
+
+        with stage("sort"):
+            for row, (i, _) in enumerate(valid):
+                matches = match_engine.top_matches(matrix, (total[row], a[row], c[row], s[row]), top_k)
+                results[i] = {"index": i, "matches": matches}
+
+        with stage("serialize"):
+            return jsonify({"success": True, "results": results})
+    except Exception as e:
+        logger.error("Match batch error: %s", e)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/match-cache', methods=['GET'])
+def match_cache_stats():
+    return jsonify(ranking_cache.stats())
+
+@app.route('/api/data-version', methods=['GET'])
+def data_version():
+    """Version of the loaded data and the checksum of each file behind it."""
+    return jsonify(current_data().describe())
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus scrape target; only answered for local callers."""
+    if request.remote_addr not in ('127.0.0.1', '::1'):
+        return jsonify({"error": "metrics are only available locally"}), 403
+    return metrics.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+# Most (school, program) pairs accepted by one batch chance-me request
+MAX_CHANCE_BATCH = 50
+
+def parse_ecs(ecs_input):
+    """ECs arrive as a comma-separated string (or a list); split and clean them up."""
+    if not ecs_input:
+        return []
+    if isinstance(ecs_input, str):
+        ecs_input = ecs_input.split(',')
+    return [ec.strip() for ec in ecs_input if ec.strip()]
+
+def is_chance_pair(pair):
+    """A batch pair is an object whose school and program (if given) are strings."""
+    return isinstance(pair, dict) and all(isinstance(pair.get(key, ''), str) for key in ('school', 'program'))
+
 @app.route('/api/chance-me', methods=['POST'])
 def chance_me_api():
     try:
-        print("ChanceMe request received!")  # Debug print
         data = request.json
-        print("Received ChanceMe data:", data)  # Debug print
+        metrics.debug_sampled("ChanceMe request: %s", data)
         
         # Extract data from request
         university = data.get('school', '')
         program = data.get('program', '')
         top6_avg = float(data.get('top6', 0))
-        ecs_input = data.get('ecs', '')
-        
-        # Parse ECs (split by comma and clean up)
-        ecs = []
-        if ecs_input:
-            ecs = [ec.strip() for ec in ecs_input.split(',') if ec.strip()]
-        
-        # Path to CSV file (adjust this path as needed)
-        csv_path = 'backend/admissionsData.csv'
+        ecs = parse_ecs(data.get('ecs', ''))
         
         # Get prediction
-        result = predict_admission_chance(csv_path, university, program, top6_avg, ecs)
+        result = predict_admission_chance(current_admissions(), university, program, top6_avg, ecs)
         
         return jsonify({
             "success": True,
-            "prediction": result,
+            "prediction": render_admission_result(result),
+            "result": result.to_dict(),
             "inputs": {
                 "university": university,
                 "program": program,
@@ -206,129 +232,320 @@ def chance_me_api():
         })
         
     except Exception as e:
-        print("ChanceMe Error:", str(e))
+        logger.error("ChanceMe error: %s", e)
         return jsonify({
             "success": False,
             "error": str(e)
         }), 500
 
+@app.route('/api/chance-me/batch', methods=['POST'])
+def chance_me_batch_api():
+    try:
+        data = request.json
+
+        top6_avg = float(data.get('top6', 0))
+        ecs = parse_ecs(data.get('ecs', ''))
+        pairs = data.get('pairs', [])
+
+        if not isinstance(pairs, list) or not all(is_chance_pair(pair) for pair in pairs):
+            return jsonify({"success": False, "error": "pairs must be a list of {school, program} objects"}), 400
+        if len(pairs) > MAX_CHANCE_BATCH:
+            return jsonify({"success": False, "error": f"at most {MAX_CHANCE_BATCH} pairs per request"}), 400
+
+        # Text rendering is opt-in; batch callers usually only want the numbers
+        render = bool(data.get('render', False))
+
+        # Each pair is {"school": ..., "program": ...}
+        queries = [(pair.get('school', ''), pair.get('program', '')) for pair in pairs]
+        predictions = predict_admission_chance_batch(current_admissions(), queries, top6_avg, ecs)
+
+        results = []
+        for (school, program), prediction in zip(queries, predictions):
+            entry = {"school": school, "program": program, "result": prediction.to_dict()}
+            if render:
+                entry["prediction"] = render_admission_result(prediction)
+            results.append(entry)
+
+        return jsonify({
+            "success": True,
+            "results": results,
+            "inputs": {
+                "top6_average": top6_avg,
+                "extracurriculars": ecs
+            }
+        })
+
+    except Exception as e:
+        logger.error("ChanceMe batch error: %s", e)
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+# Rendered PDFs are cached by payload hash; async jobs run in a process pool
+pdf_jobs = PDFJobs()
+metrics.caches.register("pdf", pdf_jobs)
+
+def pdf_download_name():
+    return f"LinkU_matches_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+
+# Rows in the PDF when the server computes the ranking itself
+PDF_RESULTS = 100
+
+def pdf_payload(data):
+    """
+    Results and weights for a PDF request. The body carries either the
+    ranked results (as returned by /api/full-matches) or just the quiz
+    answers under "answers", in which case the ranking is computed here and
+    usually comes straight from the ranking cache. The weights shown in the
+    PDF then default to the ones that ranking used.
+    """
+    if 'answers' in data:
+        results = compute_matches(data['answers'], num_results=PDF_RESULTS)
+        used = match_engine.normalize_weights(data['answers'])
+        default_weights = {key: used[key] for key in ('wa', 'wc', 'wso')}
+    else:
+        results = data.get('results', [])
+        default_weights = {'wa': 0.6, 'wc': 0.2, 'wso': 0.2}
+    return results, data.get('weights', default_weights)
+
 @app.route('/api/download-pdf', methods=['POST'])
 def download_pdf():
     try:
         # Get results from request
-        data = request.json
-        results = data.get('results', [])
-        weights = data.get('weights', {'wa': 0.6, 'wc': 0.2, 'wso': 0.2})
-        
-        # Generate PDF bytes
-        from match_me import generate_matches_pdf_bytes
-        pdf_buffer = generate_matches_pdf_bytes(results, weights)
+        results, weights = pdf_payload(request.json)
         
-        # Generate filename with timestamp
-        filename = f"LinkU_matches_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        # Render (or reuse the cached render of) the PDF
+        with stage("pdf"):
+            pdf_file = pdf_jobs.render(results, weights)
         
-        # Send file to client for download
+        # Send file to client for download (a path, or a buffer if it couldn't be cached)
         return send_file(
-            pdf_buffer,
+            pdf_file,
             mimetype='application/pdf',
             as_attachment=True,
-            download_name=filename
+            download_name=pdf_download_name()
         )
         
     except Exception as e:
-        print(f"PDF generation error: {str(e)}")
+        logger.error("PDF generation error: %s", e)
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/download-pdf/jobs', methods=['POST'])
+def start_pdf_job():
+    """
+    Start rendering in the background; the body is the same as for
+    /api/download-pdf. Poll (or simply GET) the returned url for the file.
+    """
+    try:
+        results, weights = pdf_payload(request.json)
+        job_id = pdf_jobs.submit(results, weights)
+        return jsonify({
+            "success": True,
+            "job_id": job_id,
+            "status": pdf_jobs.status(job_id),
+            "url": f"/api/download-pdf/jobs/{job_id}"
+        }), 202
+    except Exception as e:
+        logger.error("PDF job error: %s", e)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/download-pdf/jobs/<job_id>', methods=['GET'])
+def get_pdf_job(job_id):
+    status = pdf_jobs.status(job_id) if is_job_id(job_id) else None
+    if status is None:
+        return jsonify({"success": False, "error": "Unknown PDF job"}), 404
+    if status == "pending":
+        return jsonify({"success": True, "job_id": job_id, "status": status}), 202
+    if status == "failed":
+        return jsonify({"success": False, "job_id": job_id, "status": status, "error": pdf_jobs.error(job_id)}), 500
+    # send_file streams from disk in blocks rather than reading the PDF into memory
+    return send_file(
+        pdf_jobs.pdf_path(job_id),
+        mimetype='application/pdf',
+        as_attachment=True,
+        download_name=pdf_download_name()
+    )
+
+# Rows per chunk written to a streamed /api/full-matches response
+STREAM_CHUNK = 100
+
+def match_page_args(args, default_limit):
+    """offset and limit from query args or a JSON body; limit defaults to default_limit (None = all)."""
+    offset = int(args.get('offset', 0))
+    limit = args.get('limit')
+    limit = default_limit if limit is None else int(limit)
+    if offset < 0 or (limit is not None and limit < 0):
+        raise ValueError("offset and limit must not be negative")
+    return offset, limit
+
+def stream_match_rows(matrix, scores, order):
+    """NDJSON lines for the programs in order, a chunk at a time."""
+    for start in range(0, len(order), STREAM_CHUNK):
+        rows = match_engine.match_rows(matrix, scores, order[start:start + STREAM_CHUNK])
+        yield "".join(json.dumps(row) + "\n" for row in rows)
+
 @app.route('/api/full-matches', methods=['POST'])
 def get_full_matches():
+    """
+    Ranked matches for the quiz answers in the body, 100 by default.
+
+    Query parameters:
+        offset, limit  page through the ranking; later pages come from the
+                       cached scores, so scrolling never re-scores
+        stream=1       newline-delimited JSON, one match per line, written as
+                       it is produced; without a limit every program is sent
+    """
+    stream = request.args.get('stream') in ('1', 'true')
+    try:
+        offset, limit = match_page_args(request.args, None if stream else 100)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
     try:
         # Get quiz answers
         answers = request.json
         
-        # Compute all matches
-        results = compute_matches(answers, num_results=100)
+        # Rank every program (or reuse the cached ranking) and take the page
+        matrix, scores, ranking_id = ranking(answers)
+        total = matrix.size
+        end = total if limit is None else min(offset + limit, total)
+        next_offset = end if end < total else None
+
+        if stream:
+            with stage("sort"):
+                order = match_engine.top_k(scores[0], end)[offset:]
+            headers = {"X-Total-Count": str(total), "X-Ranking-Id": ranking_id}
+            if next_offset is not None:
+                headers["X-Next-Offset"] = str(next_offset)
+            return Response(stream_with_context(stream_match_rows(matrix, scores, order)),
+                            mimetype='application/x-ndjson', headers=headers)
+
+        with stage("sort"):
+            results = match_engine.top_matches(matrix, scores, end - offset, offset) if end > offset else []
         
         # Results are already in the right format, no need to transform
-        return jsonify({
-            "success": True,
-            "matches": results
-        })
+        with stage("serialize"):
+            return jsonify({
+                "success": True,
+                "matches": results,
+                "total": total,
+                "next_offset": next_offset,
+                "ranking_id": ranking_id
+            })
     except Exception as e:
-        print(f"Error computing matches: {str(e)}")
+        logger.error("Error computing matches: %s", e)
         return jsonify({"success": False, "error": str(e)}), 500
 
-# For Flask 2.0+ 
-mentors_data = {}
-
-def load_mentors_data():
-    global mentors_data
+@app.route('/api/rerank', methods=['POST'])
+def rerank_api():
+    """
+    Re-rank a previous result with new weights, without re-scoring:
+    {"ranking_id": ..., "wa": ..., "wc": ..., "wso": ..., "offset"?, "limit"?}.
+    ranking_id comes from /api/full-matches. A 404 means the handle is no
+    longer cached here (evicted, data reloaded, or another worker); send
+    the full answers again instead.
+    """
     try:
-        mentors_file = os.path.join(os.path.dirname(__file__), 'mentors.json')
-        with open(mentors_file, 'r', encoding='utf-8') as f:
-            mentors_data = json.load(f)
-    except Exception as e:
-        print(f"Error loading mentors data: {e}")
-        mentors_data = {
-            "mentors": [],
-            "programMentors": {}
-        }
+        data = request.json
+        matrix = current_data().programs
+        ranking_id = data.get('ranking_id')
+        offset, limit = match_page_args(data, 100)
 
-# Load data at startup
-load_mentors_data()
+        components = component_cache.get((matrix.version, ranking_id))
+        if components is None:
+            return jsonify({"success": False, "error": "unknown or expired ranking_id"}), 404
+
+        with stage("weigh"):
+            scores = match_engine.weigh_components(components, match_engine.normalize_weights(data))
+        end = min(offset + limit, matrix.size)
+        with stage("sort"):
+            results = match_engine.top_matches(matrix, scores, end - offset, offset) if end > offset else []
+
+        with stage("serialize"):
+            return jsonify({
+                "success": True,
+                "matches": results,
+                "total": matrix.size,
+                "next_offset": end if end < matrix.size else None,
+                "ranking_id": ranking_id
+            })
+    except (TypeError, ValueError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        logger.error("Rerank error: %s", e)
+        return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/api/mentors', methods=['GET'])
 def get_all_mentors():
-    return jsonify(mentors_data.get('mentors', []))
+    return jsonify(current_data().mentors.mentors)
+
+MAX_MENTOR_BATCH = 50
+
+def mentor_rng(seed, program_key):
+    # Without a seed the random fallback differs on every call
+    return random if seed is None else seeded_rng(seed, program_key)
 
 @app.route('/api/program-mentors/<path:program_key>', methods=['GET'])
 def get_program_mentors(program_key):
     try:
-        print(f"Received request for program key: {program_key}")
-        
-        # Debug: Print all available program keys
-        available_keys = list(mentors_data.get('programMentors', {}).keys())
-        print(f"Available keys: {available_keys}")
-        
-        # Find specific mentors for this program first
-        mentor_ids = mentors_data.get('programMentors', {}).get(program_key, [])
-        print(f"Found mentor IDs for {program_key}: {mentor_ids}")
-        
-        program_mentors = [
-            mentor for mentor in mentors_data.get('mentors', []) 
-            if mentor['id'] in mentor_ids
-        ]
-        
-        # If we found ANY program-specific mentors, return them (even just one)
-        if program_mentors:
-            print(f"Found {len(program_mentors)} specific mentors for {program_key}")
-            return jsonify(program_mentors)
-        
-        # Extract university name for fallback
-        parts = program_key.split('_')
-        university = parts[0] if len(parts) >= 1 else None
-        
-        # Look for university match if no program match was found
-        if university:
-            university_mentors = [
-                mentor for mentor in mentors_data.get('mentors', [])
-                if university.lower() in mentor['school'].lower()
-            ]
-            
-            if university_mentors:
-                print(f"Found {len(university_mentors)} mentors from {university}")
-                return jsonify(university_mentors[:2])
-        
-        # Last resort: random mentors
-        print("No matches found, using random mentors")
-        all_mentors = mentors_data.get('mentors', [])
-        random_mentors = random.sample(all_mentors, min(2, len(all_mentors)))
-        
-        return jsonify(random_mentors)
-        
+        seed = request.args.get('seed')
+        # Program mentors first, then the same university, then random ones
+        return jsonify(current_data().mentors.mentors_for(program_key, mentor_rng(seed, program_key)))
     except Exception as e:
-        print(f"Error in program-mentors endpoint: {str(e)}")
+        logger.error("Error in program-mentors endpoint: %s", e)
         return jsonify([])
 
+@app.route('/api/program-mentors/batch', methods=['POST'])
+def get_program_mentors_batch():
+    """
+    Mentors for several program keys in one request: {"keys": [...], "seed"?}.
+    With a seed the random fallback is deterministic per key, so the same
+    request always gets the same response (and GET ?seed= agrees with it).
+    """
+    try:
+        data = request.json
+        keys = data.get('keys', [])
+        seed = data.get('seed')
+
+        if not isinstance(keys, list) or not all(isinstance(key, str) for key in keys):
+            return jsonify({"success": False, "error": "keys must be a list of strings"}), 400
+        if len(keys) > MAX_MENTOR_BATCH:
+            return jsonify({"success": False, "error": f"at most {MAX_MENTOR_BATCH} keys per request"}), 400
+        if seed is not None:
+            seed = str(seed)
+
+        index = current_data().mentors
+        results = [
+            {"program_key": key, "mentors": index.mentors_for(key, mentor_rng(seed, key))}
+            for key in keys
+        ]
+        return jsonify({"success": True, "results": results})
+    except Exception as e:
+        logger.error("Error in program-mentors batch endpoint: %s", e)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+def create_app():
+    """
+    Application factory for gunicorn --preload (see gunicorn.conf.py).
+
+    Runs once in the master: every read-only structure (program matrix,
+    admissions stats, mentors) is built here, then the heap is frozen so the
+    forked workers share those pages copy-on-write. The data watcher
+    thread is not started here but by each worker's first request. Without
+    gc.freeze() the first collection in each worker writes GC headers on
+    every inherited object and quietly copies most of the heap.
+    """
+    data_registry.load()
+
+    gc.collect()
+    gc.freeze()
+    # Frozen objects are never scanned, so collection can resume (gunicorn.conf.py
+    # turns it off while the data loads) in the master and every worker forked from it
+    gc.enable()
+    return app
+
 if __name__ == '__main__':
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"))
     print("Starting Flask server on port 5001...")
     app.run(host='0.0.0.0', port=5001, debug=True)
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""
+Random quiz submissions for the matcher benchmarks and parity checks.
+"""
+import random
+
+INTERESTS = ["Engineering", "CS/Math", "Business", "Arts/Humanities", "Sciences", "Health", "Undecided"]
+COURSES = ["Math", "Physics", "Biology", "Chemistry", "Computer Science", "Business",
+           "Language Arts", "History", "Geography", "Visual Arts", "Autoshop"]
+NUMERIC_ANSWERS = ['LS', 'SP', 'CO', 'UR', 'CR', 'CE', 'ME', 'CP', 'NS', 'CEV']
+
+
+def vocabulary(programs, section, field):
+    return sorted({item for p in programs for item in p[section].get(field, [])})
+
+
+class AnswerGenerator:
+    """Draws answers from the quiz's value space and the profiles' own vocabulary."""
+
+    def __init__(self, programs, seed=0):
+        self.rng = random.Random(seed)
+        self.alts = vocabulary(programs, 'academic', 'alt_to_engineering')
+        self.housing = vocabulary(programs, 'campus', 'housing_styles')
+        self.sports = vocabulary(programs, 'social', 'sports')
+        self.clubs = vocabulary(programs, 'social', 'clubs')
+
+    def __call__(self):
+        rng = self.rng
+        answers = {key: rng.randint(1, 5) for key in NUMERIC_ANSWERS}
+        answers.update({key: rng.randint(1, 10) for key in ('wa', 'wc', 'wso')})
+        answers.update({
+            "AA": rng.sample(INTERESTS, rng.randint(0, 3)),
+            "LC": rng.sample(COURSES, rng.randint(0, 5)),
+            "ALT": rng.sample(self.alts, rng.randint(0, 3)),
+            "CSB": rng.choice(["< 60", "60-200", "200+"]),
+            "SET": rng.choice(["Urban", "Suburban", "Small-town", "Rural"]),
+            "HS": rng.sample(self.housing, rng.randint(0, len(self.housing))),
+            "CPS": rng.choice(["Small", "Medium", "Large"]),
+            "SPT": rng.sample(self.sports, rng.randint(0, 3)),
+            "CLB": rng.sample(self.clubs, rng.randint(0, 3)),
+        })
+        return answers
+
+    def batch(self, count):
+        return [self() for _ in range(count)]
@@ -0,0 +1,67 @@
+"""
+Microbenchmark: EC keyword scoring for chance-me.
+
+Compares the original note-by-EC Python loop with ECMatcher over the cached
+lowercased notes of every program in the offer stats table, checking
+that both give the same match count.
+
+Usage:
+    python3 benchmarks/bench_ec_matching.py
+"""
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from chanceMe import ECMatcher, load_admissions_data
+
+CSV_PATH = os.path.join(BACKEND_DIR, 'admissionsData.csv')
+
+USER_ECS = [
+    "robotics", "Student Council", "volunteering", "DECA", "hackathon",
+    "coding", "math contest", "research", "sports", "music",
+    "robot", "volunteering",
+]
+
+
+def loop_match_count(user_ecs, notes):
+    match_count = 0
+    for note in notes:
+        note_lower = note.lower()
+        for ec in user_ecs:
+            if ec.lower() in note_lower:
+                match_count += 1
+    return match_count
+
+
+if __name__ == "__main__":
+    data = load_admissions_data(CSV_PATH)
+    groups = [(list(s.notes), s.notes_text) for s in data.offer_stats_table.values()]
+    groups.sort(key=lambda g: len(g[0]), reverse=True)
+
+    matcher = ECMatcher(USER_ECS)
+    for notes, notes_text in groups:
+        assert loop_match_count(USER_ECS, notes) == matcher.count_matches(notes_text)
+        for ec in USER_ECS + [""]:
+            assert loop_match_count([ec], notes) == ECMatcher([ec]).count_matches(notes_text)
+
+    for label, subset in (("all programs", groups), ("10 largest groups", groups[:10])):
+        repeat = 5
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for notes, _ in subset:
+                loop_match_count(USER_ECS, notes)
+        loop_t = (time.perf_counter() - start) / (repeat * len(subset))
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for _, notes_text in subset:
+                matcher.count_matches(notes_text)
+        vec_t = (time.perf_counter() - start) / (repeat * len(subset))
+
+        notes_per_group = sum(len(n) for n, _ in subset) / len(subset)
+        print(f"{label}: {len(subset)} groups, {notes_per_group:.0f} notes/group, {len(USER_ECS)} ECs")
+        print(f"    python loop:     {loop_t * 1e6:8.1f} us/group")
+        print(f"    ECMatcher:       {vec_t * 1e6:8.1f} us/group")
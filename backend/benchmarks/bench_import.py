@@ -0,0 +1,47 @@
+"""
+Benchmark: cold import time of the backend modules.
+
+Imports each module in a fresh interpreter started from an unrelated working
+directory (as a gunicorn worker would be) and reports the median wall time.
+Importing match_me must not read program_profiles.json or load reportlab;
+the script checks that too.
+
+Usage:
+    python3 benchmarks/bench_import.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import sys, time
+sys.path.insert(0, {backend!r})
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed, 'reportlab' in sys.modules, getattr({module}, '_programs', None) is not None)
+"""
+
+
+def cold_import(module, cwd):
+    code = PROBE.format(backend=BACKEND_DIR, module=module)
+    out = subprocess.run([sys.executable, "-c", code], cwd=cwd, capture_output=True, text=True, check=True)
+    elapsed, reportlab, programs = out.stdout.split()[-3:]
+    return float(elapsed), reportlab == "True", programs == "True"
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    with tempfile.TemporaryDirectory() as cwd:
+        for module in ("match_me", "match_engine", "chanceMe", "api"):
+            samples = [cold_import(module, cwd) for _ in range(runs)]
+            times = [t for t, _, _ in samples]
+            _, reportlab, programs = samples[-1]
+            print(f"import {module:<13} median {statistics.median(times) * 1000:7.1f} ms"
+                  f"  reportlab loaded: {reportlab}  match_me profiles parsed: {programs}")
+            if module == "match_me":
+                assert not reportlab and not programs, "match_me import has side effects"
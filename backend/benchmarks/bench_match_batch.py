@@ -0,0 +1,59 @@
+"""
+Benchmark: /api/match/batch against one /api/match call per student.
+
+Posts a class of random quiz submissions through Flask's test client, once
+as a single batch request and once as one request per student (with the
+ranking cache cleared, so every call scores), checks both return the same
+top-K rankings and prints the wall time of each. The engine-level timings
+(score_programs_batch vs. score_programs in a loop) are printed as well.
+
+Usage:
+    python3 benchmarks/bench_match_batch.py [students] [top_k]
+"""
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+import api
+import match_engine
+from match_me import get_programs
+from benchmarks.answers import AnswerGenerator
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    submissions = AnswerGenerator(get_programs(), seed=23).batch(students)
+    client = api.app.test_client()
+    matrix = api.data_registry.current.programs
+
+    normalized = [match_engine.normalize_answers(answers) for answers in submissions]
+    _, engine_loop = timed(lambda: [match_engine.score_programs(matrix, answers) for answers in normalized])
+    _, engine_batch = timed(lambda: match_engine.score_programs_batch(matrix, normalized))
+
+    def one_by_one():
+        api.ranking_cache.clear()
+        return [client.post('/api/match', json=answers).get_json() for answers in submissions]
+
+    batch, batch_t = timed(lambda: client.post('/api/match/batch', json={"answers": submissions, "top_k": k}).get_json())
+    single, single_t = timed(one_by_one)
+
+    ranked = [entry["matches"] for entry in batch["results"]]
+    expected = [match_engine.compute_matches(matrix, answers, k) for answers in submissions]
+    assert ranked == expected, "batch rankings differ from compute_matches"
+    if k == 10:
+        assert ranked == single, "batch rankings differ from /api/match"
+
+    print(f"{students} students, top {k}")
+    print(f"  engine: score_programs loop {engine_loop * 1000:8.1f} ms   score_programs_batch {engine_batch * 1000:8.1f} ms")
+    print(f"  http:   /api/match x{students} {single_t * 1000:8.1f} ms   /api/match/batch   {batch_t * 1000:8.1f} ms"
+          f"   ({single_t / batch_t:.1f}x)")
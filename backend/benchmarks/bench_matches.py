@@ -0,0 +1,64 @@
+"""
+Benchmark: per-program Python scoring vs. the vectorized match engine.
+
+Scores random quiz submissions against every program in
+program_profiles.json with the original loop over match_me's score_*
+functions and with match_engine, checks the rankings agree, and prints
+requests per second for each.
+
+Usage:
+    python3 benchmarks/bench_matches.py [submissions]
+"""
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+import match_engine
+from match_me import programs, score_academic, score_campus, score_social
+from benchmarks.answers import AnswerGenerator
+
+def loop_matches(answers, num_results=10):
+    user_answers = match_engine.normalize_answers(answers)
+    results = []
+    for p in programs:
+        a = score_academic(p, user_answers)
+        c = score_campus(p, user_answers)
+        s = score_social(p, user_answers)
+        total = (user_answers['wa'] * a + user_answers['wc'] * c + user_answers['wso'] * s) / user_answers['W_TOTAL']
+        results.append({"school": p['uni'], "program": p['program'], "overall": total,
+                        "academic": a, "campus": c, "social": s})
+    results.sort(key=lambda x: x["overall"], reverse=True)
+    return results[:num_results]
+
+
+def requests_per_second(fn, submissions):
+    start = time.perf_counter()
+    for answers in submissions:
+        fn(answers)
+    return len(submissions) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    submissions = AnswerGenerator(programs).batch(count)
+
+    start = time.perf_counter()
+    matrix = match_engine.ProgramMatrix(programs)
+    compile_t = time.perf_counter() - start
+
+    def engine_matches(answers, num_results=10):
+        return match_engine.compute_matches(matrix, answers, num_results)
+
+    for answers in submissions:
+        assert loop_matches(answers, len(programs)) == engine_matches(answers, len(programs))
+
+    before = requests_per_second(loop_matches, submissions)
+    after = requests_per_second(engine_matches, submissions)
+
+    print(f"{len(programs)} programs, {count} submissions, rankings identical")
+    print(f"compile ProgramMatrix: {compile_t * 1000:8.1f} ms")
+    print(f"python loop:           {before:8.1f} req/s")
+    print(f"match_engine:          {after:8.1f} req/s ({after / before:.1f}x)")
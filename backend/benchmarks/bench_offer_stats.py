@@ -0,0 +1,59 @@
+"""
+Benchmark: precomputed offer statistics table vs. the substring search path.
+
+Runs every distinct (university, program) pair in admissionsData.csv through
+both paths, checks they agree, and prints the per-query cost of each.
+
+Usage:
+    python3 benchmarks/bench_offer_stats.py
+"""
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from chanceMe import load_admissions_data
+
+CSV_PATH = os.path.join(BACKEND_DIR, 'admissionsData.csv')
+
+
+def substring_stats(data, university, program):
+    rows = data.find_offer_rows(university, program)
+    return data._offer_stats(rows) if len(rows) else None
+
+
+def same_stats(a, b):
+    return (a.count, a.mean, a.min, a.max, a.supp_required, list(a.notes)) == \
+        (b.count, b.mean, b.min, b.max, b.supp_required, list(b.notes))
+
+
+def time_path(fn, queries, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for university, program in queries:
+            fn(university, program)
+    return (time.perf_counter() - start) / (repeat * len(queries))
+
+
+if __name__ == "__main__":
+    data = load_admissions_data(CSV_PATH)
+    df = data.df
+    queries = sorted({(u, p) for u, p in zip(df["University"], df["Program name"]) if isinstance(p, str)})
+
+    for university, program in queries:
+        exact = data.offer_stats(university, program)
+        slow = substring_stats(data, university, program)
+        assert (exact is None) == (slow is None), (university, program)
+        assert exact is None or same_stats(exact, slow), (university, program)
+
+    repeat = 5
+    hits = [(u, p) for u, p in queries if (u.lower(), p.lower()) in data.offer_stats_table]
+    exact_t = time_path(data.offer_stats, hits, repeat)
+    slow_t = time_path(lambda u, p: substring_stats(data, u, p), hits, repeat)
+
+    print(f"{len(queries)} distinct programs, {len(hits)} with offers ({len(data.offer_stats_table)} table entries)")
+    print(f"substring path: {slow_t * 1e6:8.1f} us/query")
+    print(f"stats table:    {exact_t * 1e6:8.1f} us/query")
+    print(f"speedup:        {slow_t / exact_t:8.1f}x")
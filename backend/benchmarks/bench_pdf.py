@@ -0,0 +1,87 @@
+"""
+Benchmark: matches PDF generation at 100, 500 and 1,400 rows.
+
+Renders a real ranking (every program scored for one random submission)
+with generate_matches_pdf_bytes, from both the API's dict results and the
+frontend's 6-tuples, and prints the median wall time per size. It also
+times the highlight pass on its own: the single pass over numeric scores
+against the old second pass that re-parsed the formatted table strings.
+
+Usage:
+    python3 benchmarks/bench_pdf.py [runs]
+"""
+import os
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+import match_engine
+from match_me import programs, generate_matches_pdf_bytes, pdf_rows, HIGHLIGHT_THRESHOLD, HIGHLIGHT_CUTOFF
+from benchmarks.answers import AnswerGenerator
+
+SIZES = (100, 500, 1400)
+
+
+def median_time(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def reparse_highlights(results):
+    """The old styling pass: format every score, then float() it back."""
+    table_data = [None] + [
+        [str(i + 1), uni, prog, f"{a:.3f}", f"{c:.3f}", f"{soc:.3f}", f"{tot:.3f}"]
+        for i, (tot, a, c, soc, uni, prog) in enumerate(results)
+    ]
+    cells = []
+    for row in range(1, len(table_data)):
+        for col in (3, 4, 5):
+            try:
+                if float(table_data[row][col]) > HIGHLIGHT_THRESHOLD:
+                    cells.append((col, row))
+            except (ValueError, TypeError):
+                pass
+    return cells
+
+
+def single_pass_highlights(results):
+    cells = []
+    for row, (tot, a, c, soc, uni, prog) in enumerate(pdf_rows(results), start=1):
+        formatted = [str(row), uni, prog, f"{a:.3f}", f"{c:.3f}", f"{soc:.3f}", f"{tot:.3f}"]
+        if a > HIGHLIGHT_CUTOFF:
+            cells.append((3, row))
+        if c > HIGHLIGHT_CUTOFF:
+            cells.append((4, row))
+        if soc > HIGHLIGHT_CUTOFF:
+            cells.append((5, row))
+    return cells
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    matrix = match_engine.ProgramMatrix(programs)
+    answers = AnswerGenerator(programs).batch(1)[0]
+    ranking = match_engine.compute_matches(matrix, answers, len(programs))
+    tuples = [(r["overall"], r["academic"], r["campus"], r["social"], r["school"], r["program"]) for r in ranking]
+
+    # Warm the per-process reportlab template so it is not counted in the first size
+    generate_matches_pdf_bytes(tuples[:1])
+
+    for size in SIZES:
+        rows_t = tuples[:size]
+        rows_d = ranking[:size]
+        assert reparse_highlights(rows_t) == single_pass_highlights(rows_t) == single_pass_highlights(rows_d)
+
+        pdf_t = median_time(lambda: generate_matches_pdf_bytes(rows_t, max_rows=None), runs)
+        pdf_d = median_time(lambda: generate_matches_pdf_bytes(rows_d, max_rows=None), runs)
+        old = median_time(lambda: reparse_highlights(rows_t), runs * 20)
+        new = median_time(lambda: single_pass_highlights(rows_d), runs * 20)
+        print(f"{len(rows_t):>5} rows  pdf (tuples) {pdf_t * 1000:8.1f} ms  pdf (dicts) {pdf_d * 1000:8.1f} ms"
+              f"  highlight pass {old * 1000:6.2f} -> {new * 1000:6.2f} ms")
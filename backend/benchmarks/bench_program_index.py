@@ -0,0 +1,82 @@
+"""
+Benchmark: trigram program-name index vs. the pandas substring scan.
+
+Checks that ProgramNameIndex.search returns exactly the rows that
+str.contains(..., regex=False) selects for every distinct program name and a
+sample of substrings of them, then times both on the current data and on a
+copy scaled up to simulate more years of admissions data.
+
+Usage:
+    python3 benchmarks/bench_program_index.py [scale]
+"""
+import os
+import random
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from chanceMe import ProgramNameIndex, load_admissions_data
+
+CSV_PATH = os.path.join(BACKEND_DIR, 'admissionsData.csv')
+
+
+def pandas_search(names, rows, query):
+    return rows[names.str.contains(query, regex=False, na=False).to_numpy()]
+
+
+def sample_queries(names, rng, per_name=3):
+    queries = []
+    for name in names:
+        queries.append(name)
+        for _ in range(per_name):
+            start = rng.randrange(len(name))
+            queries.append(name[start:start + rng.randint(1, 12)])
+    return queries + ["", "zzz", "engineering", "co-op"]
+
+
+def scaled(names, scale):
+    # Each extra copy gets a year suffix so the index sees new distinct names
+    if scale == 1:
+        return names
+    copies = [names] + [names.where(names.isna(), names + f" ({2000 + i})") for i in range(1, scale)]
+    return pd.concat(copies, ignore_index=True)
+
+
+def run(data, scale, rng):
+    pandas_t = index_t = 0.0
+    checked = 0
+    for key, rows in data.rows_by_university_decision.items():
+        names = scaled(data.program_lower.iloc[rows].reset_index(drop=True), scale)
+        positions = np.arange(len(names), dtype=np.intp)
+        index = ProgramNameIndex(names, positions)
+        queries = sample_queries(index.names[:50], rng)
+
+        start = time.perf_counter()
+        expected = [pandas_search(names, positions, q) for q in queries]
+        pandas_t += time.perf_counter() - start
+
+        start = time.perf_counter()
+        found = [index.search(q) for q in queries]
+        index_t += time.perf_counter() - start
+
+        for query, a, b in zip(queries, expected, found):
+            assert np.array_equal(a, b), (key, query)
+        checked += len(queries)
+    return checked, pandas_t, index_t
+
+
+if __name__ == "__main__":
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    data = load_admissions_data(CSV_PATH)
+    rng = random.Random(0)
+
+    for factor in (1, scale):
+        checked, pandas_t, index_t = run(data, factor, rng)
+        print(f"x{factor:<3} {len(data.df) * factor:7d} rows, {checked} queries match")
+        print(f"     pandas str.contains: {pandas_t / checked * 1e6:8.1f} us/query")
+        print(f"     trigram index:       {index_t / checked * 1e6:8.1f} us/query")
@@ -0,0 +1,87 @@
+"""
+Parity check: match_engine against the original per-program scoring.
+
+Scores random submissions plus hand-picked edge cases (empty answers,
+frontend-style lowercase values, duplicate picks, "None" sports, zero
+weights for the CLI) with the untouched original scorers in
+benchmarks/reference_scoring.py and with the vectorized engine, and
+requires identical scores and rankings for both the API and the CLI entry
+points. The reference shares no code with the engine, so a regression in
+the shared helpers can't hide in both paths. Exits non-zero on any mismatch.
+
+Usage:
+    python3 benchmarks/check_parity.py [submissions]
+"""
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+import match_engine
+import match_me
+from match_me import programs
+from benchmarks.answers import AnswerGenerator
+from benchmarks.reference_scoring import reference_answers, score_academic, score_campus, score_social
+
+EDGE_CASES = [
+    {},
+    {"AA": ["engineering", "cs-math"], "LC": ["math", "physics"], "HS": ["traditional-dorm"],
+     "CSB": "< 60", "SET": "urban", "CPS": "small", "SPT": ["none"], "CLB": ["hackathons"]},
+    {"AA": ["Engineering", "Engineering", "Business"], "LC": ["Math", "Math", "Physics"],
+     "ALT": ["Economics", "Economics"], "SPT": ["None", "Hockey"], "CLB": []},
+    {"AA": ["Accounting", "finance"], "LC": ["Mathematics", "Business Studies"], "CSB": "200+",
+     "SET": "Rural", "CPS": "Large", "HS": ["Apartment"], "CO": 5, "UR": 4, "CR": 5},
+    {"wa": 0, "wc": 0, "wso": 2, "CSB": None, "SET": None, "CPS": None},
+    {"wa": "3", "wc": "2.5", "wso": 1, "LS": "5", "NS": "1", "CEV": "5"},
+]
+
+
+def reference_scores(user_answers):
+    for p in programs:
+        a = score_academic(p, user_answers)
+        c = score_campus(p, user_answers)
+        s = score_social(p, user_answers)
+        yield (user_answers['wa'] * a + user_answers['wc'] * c + user_answers['wso'] * s) / (user_answers['W_TOTAL'] or 1), a, c, s
+
+
+def reference_ranking(user_answers):
+    rows = [score + (p['uni'], p['program']) for score, p in zip(reference_scores(user_answers), programs)]
+    rows.sort(reverse=True, key=lambda row: row[0])
+    return rows
+
+
+def check(matrix, answers):
+    """List of problems found for one raw submission."""
+    problems = []
+    normalized = match_engine.normalize_answers(answers)
+    if normalized != reference_answers(answers):
+        problems.append("normalized answers differ")
+
+    expected = reference_ranking(reference_answers(answers))
+    if match_me.compute_matches(normalized) != expected:
+        problems.append("CLI ranking differs")
+
+    if normalized['W_TOTAL']:
+        api_rows = [(m["overall"], m["academic"], m["campus"], m["social"], m["school"], m["program"])
+                    for m in match_engine.compute_matches(matrix, answers, len(programs))]
+        if api_rows != expected:
+            problems.append("API ranking differs")
+        if match_engine.compute_matches(matrix, answers, 10) != match_engine.compute_matches(matrix, answers, 100)[:10]:
+            problems.append("top 10 is not a prefix of top 100")
+    return problems
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    matrix = match_engine.ProgramMatrix(programs)
+    submissions = EDGE_CASES + AnswerGenerator(programs, seed=1).batch(count)
+
+    failures = 0
+    for i, answers in enumerate(submissions):
+        for problem in check(matrix, answers):
+            failures += 1
+            print(f"submission {i}: {problem}: {answers}")
+
+    print(f"{len(submissions)} submissions checked, {failures} mismatches")
+    sys.exit(1 if failures else 0)
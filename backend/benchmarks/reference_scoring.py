@@ -0,0 +1,246 @@
+"""
+Independent reference scorers for benchmarks/check_parity.py.
+
+These are the per-program score functions and the API's answer parsing
+exactly as they were before the vectorized engine existed, copied here
+verbatim so they share no code with match_engine or the current match_me
+helpers (resolve_term, INTEREST_CATEGORIES, ACADEMIC_WEIGHT_TABLE, ...).
+A regression in those shared pieces then shows up as a parity mismatch.
+Only the INTEREST_MAPPINGS/COURSE_MAPPINGS tables are imported, since they
+are the profile data being matched rather than scoring logic.
+
+Do not "tidy" this file; its value is that it does not change.
+"""
+from match_me import INTEREST_MAPPINGS, COURSE_MAPPINGS
+
+
+def reference_answers(answers):
+    """Raw frontend answers unpacked the way the original API did."""
+    wa = float(answers.get("wa", 1))
+    wc = float(answers.get("wc", 1))
+    wso = float(answers.get("wso", 1))
+    return {
+        "wa": wa, "wc": wc, "wso": wso, "W_TOTAL": wa + wc + wso,
+        "AA": answers.get("AA", []),
+        "LS": int(answers.get("LS", 3)),
+        "SP": int(answers.get("SP", 3)),
+        "CO": int(answers.get("CO", 3)),
+        "UR": int(answers.get("UR", 3)),
+        "CR": int(answers.get("CR", 3)),
+        "CE": int(answers.get("CE", 3)),
+        "LC": answers.get("LC", []),
+        "ME": int(answers.get("ME", 3)),
+        "CP": int(answers.get("CP", 3)),
+        "ALT": answers.get("ALT", []),
+        "CSB": answers.get("CSB", ""),
+        "SET": answers.get("SET", ""),
+        "HS": set(answers.get("HS", [])),
+        "CPS": answers.get("CPS", ""),
+        "NS": int(answers.get("NS", 3)),
+        "SPT": set(answers.get("SPT", [])),
+        "CLB": set(answers.get("CLB", [])),
+        "CEV": int(answers.get("CEV", 3)),
+    }
+
+
+# Enhanced interest matching using mappings
+def enhanced_interest_score(user_interests, program_interests):
+    """Calculate interest score with mapping to standardized categories"""
+    if not user_interests:
+        return 0
+        
+    mapped_program_interests = set()
+    for interest in program_interests:
+        # Convert to lowercase for matching
+        interest_lower = interest.lower()
+        # Direct match first
+        if interest_lower in [i.lower() for i in user_interests]:
+            mapped_program_interests.add(interest_lower)
+            continue
+            
+        # Try mapped categories
+        for key_term in INTEREST_MAPPINGS:
+            if key_term in interest_lower:
+                category = INTEREST_MAPPINGS[key_term]
+                if category in user_interests:
+                    mapped_program_interests.add(category)
+                    break
+    
+    # Calculate match score with bonus for multiple matches
+    match_count = len(mapped_program_interests)
+    if match_count == 0:
+        return 0
+    elif match_count == 1:
+        return 0.6  # Single match
+    elif match_count == 2:
+        return 0.8  # Two matches
+    else:
+        return 1.0  # Three or more matches
+
+# Enhanced course matching using mappings
+def enhanced_course_score(user_courses, program_courses):
+    """Calculate course match score with improved mapping"""
+    if not user_courses or not program_courses:
+        return 0
+        
+    mapped_program_courses = set()
+    for course in program_courses:
+        # Convert to lowercase for matching
+        course_lower = course.lower()
+        # Direct match first
+        if course_lower in [c.lower() for c in user_courses]:
+            mapped_program_courses.add(course_lower)
+            continue
+            
+        # Try mapped categories
+        for key_term in COURSE_MAPPINGS:
+            if key_term in course_lower:
+                category = COURSE_MAPPINGS[key_term]
+                if category in user_courses:
+                    mapped_program_courses.add(category)
+                    break
+    
+    match_ratio = len(mapped_program_courses) / max(len(user_courses), 1)
+    return min(match_ratio, 1.0)  # Cap at 1.0
+
+# Scoring functions
+from math import fabs
+
+def score_academic(p, user_answers):
+    # interests (weighted 40%)
+    prog_int = p['academic']['interests']
+    i_score = enhanced_interest_score(user_answers['AA'], prog_int) * 0.4
+    
+    # courses (weighted 20%)
+    prog_lc = p['academic'].get('liked_hs_courses', [])
+    lc_score = enhanced_course_score(user_answers['LC'], prog_lc) * 0.2
+    
+    # alt (weighted 10% if engineering interest)
+    prog_alt = set(p['academic'].get('alt_to_engineering', []))
+    alt_score = 0
+    if user_answers['ALT']:
+        matched_alts = prog_alt.intersection(set(user_answers['ALT']))
+        alt_score = (len(matched_alts) / max(len(user_answers['ALT']), 1)) * 0.1
+    
+    # numeric (weighted 30%)
+    keys = ['learning_style', 'first_year_specialization', 'coop_importance', 
+            'research_importance', 'creativity_orientation', 'career_certainty', 
+            'math_enjoyment', 'collaboration_preference']
+    vals = [user_answers['LS'], user_answers['SP'], user_answers['CO'], user_answers['UR'], user_answers['CR'], user_answers['CE'], user_answers['ME'], user_answers['CP']]
+    
+    # Adjust weight based on importance
+    weights = {
+        'learning_style': 1.2,
+        'first_year_specialization': 1.0,
+        'coop_importance': 1.5 if user_answers['CO'] >= 4 else 1.0,  # Boost if user cares about co-op
+        'research_importance': 1.5 if user_answers['UR'] >= 4 else 1.0,  # Boost if user cares about research
+        'creativity_orientation': 1.2 if user_answers['CR'] >= 4 else 1.0,
+        'career_certainty': 1.0,
+        'math_enjoyment': 1.3,  # Math is important for many programs
+        'collaboration_preference': 1.0
+    }
+    
+    total_weight = sum(weights.values())
+    
+    num_scores = []
+    weight_sum = 0
+    for k, s, i in zip(keys, vals, range(len(keys))):
+        prog_val = p['academic'].get(k, 3)
+        # Closer values should score higher (5 point scale, max difference is 4)
+        similarity = 1 - (abs(prog_val - s) / 4.0)
+        weight = weights[k]
+        num_scores.append(similarity * weight)
+        weight_sum += weight
+        
+    # Normalize by weights
+    num_score = sum(num_scores) / total_weight * 0.3
+    
+    return i_score + lc_score + num_score + alt_score
+
+def score_campus(p, user_answers):
+    base = p['campus']
+    scores = []
+    
+    # Class size (weighted 25%)
+    if base.get('class_size_bin') == user_answers['CSB']:
+        scores.append(1.0)
+    else:
+        # Partial credit for close sizes
+        if user_answers['CSB'] == "< 60" and base.get('class_size_bin') == "60-200":
+            scores.append(0.5)
+        elif user_answers['CSB'] == "200+" and base.get('class_size_bin') == "60-200":
+            scores.append(0.5)
+        else:
+            scores.append(0.0)
+    
+    # Setting (weighted 25%)
+    if base.get('setting') == user_answers['SET']:
+        scores.append(1.0)
+    else:
+        # Partial credit for related settings
+        urban_suburban = {"Urban", "Suburban"}
+        rural_small = {"Small-town", "Rural"}
+        
+        if user_answers['SET'] in urban_suburban and base.get('setting') in urban_suburban:
+            scores.append(0.5)
+        elif user_answers['SET'] in rural_small and base.get('setting') in rural_small:
+            scores.append(0.5)
+        else:
+            scores.append(0.0)
+    
+    # Housing style (weighted 25%)
+    hs_prog = set(base.get('housing_styles', []))
+    if hs_prog:
+        # How many of the user's preferences are available
+        housing_score = len(user_answers['HS'].intersection(hs_prog)) / len(user_answers['HS']) if user_answers['HS'] else 0
+        scores.append(housing_score)
+    else:
+        scores.append(0.0)
+    
+    # Campus size (weighted 25%)
+    if base.get('campus_size') == user_answers['CPS']:
+        scores.append(1.0)
+    else:
+        # Partial credit for close sizes
+        sizes = ["Small", "Medium", "Large"]
+        user_idx = sizes.index(user_answers['CPS']) if user_answers['CPS'] in sizes else -1
+        prog_idx = sizes.index(base.get('campus_size')) if base.get('campus_size') in sizes else -1
+        
+        if user_idx != -1 and prog_idx != -1:
+            # 0.5 points if only one size category difference
+            scores.append(0.5 if abs(user_idx - prog_idx) == 1 else 0.0)
+        else:
+            scores.append(0.0)
+    
+    # Average all scores with equal weighting
+    return sum(scores) / len(scores)
+
+def score_social(p, user_answers):
+    base = p['social']
+    
+    # Night scene similarity (weighted 25%)
+    prog_ns = base.get('night_scene', 3)
+    # Closer values score higher (5 point scale, max difference is 4)
+    ns_score = 1 - (abs(prog_ns - user_answers['NS']) / 4.0)
+    
+    # Sports (weighted 25%)
+    sp_prog = set(base.get('sports', []))
+    if "None" in user_answers['SPT']:
+        # User doesn't care about sports
+        spt_score = 1.0
+    else:
+        # Calculate match between user preferences and available sports
+        spt_score = len(sp_prog.intersection(user_answers['SPT'])) / max(len(user_answers['SPT']), 1)
+    
+    # Clubs (weighted 25%)
+    cl_prog = set(base.get('clubs', []))
+    # Calculate match between user preferences and available clubs
+    cl_score = len(cl_prog.intersection(user_answers['CLB'])) / max(len(user_answers['CLB']), 1) if user_answers['CLB'] else 0.5
+    
+    # Cultural events frequency (weighted 25%)
+    prog_cev = base.get('cultural_event_freq', 3)
+    # Closer values score higher (5 point scale, max difference is 4)
+    cev_score = 1 - (abs(prog_cev - user_answers['CEV']) / 4.0)
+    
+    # Average all scores with equal weighting
+    return (ns_score + spt_score + cl_score + cev_score) / 4
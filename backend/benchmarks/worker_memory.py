@@ -0,0 +1,123 @@
+"""
+Report the memory of each gunicorn worker (Linux only).
+
+Reads /proc/<pid>/smaps_rollup for the master and each of its children.
+RSS counts every resident page, including pages still shared with the
+master; PSS splits shared pages between the processes mapping them, and
+Private is what a worker has copied or allocated for itself. With the
+preloaded, frozen heap (api.create_app) Private should stay small.
+
+Usage:
+    python3 benchmarks/worker_memory.py [master_pid]
+
+Without a pid the master is read from gunicorn's pidfile (GUNICORN_PIDFILE,
+default backend/gunicorn.pid, as set in gunicorn.conf.py). Failing that it
+is the gunicorn process with the most gunicorn children, so a wrapper such
+as `timeout ... gunicorn` is not mistaken for it.
+"""
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PIDFILE = os.environ.get("GUNICORN_PIDFILE", os.path.join(BACKEND_DIR, "gunicorn.pid"))
+
+FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+
+def read_cmdline(pid):
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read().replace(b"\0", b" ").decode("utf-8", "replace").strip()
+    except OSError:
+        return ""
+
+
+def read_stat(pid):
+    """(ppid, start time in clock ticks) from /proc/<pid>/stat."""
+    with open(f"/proc/{pid}/stat", "r") as f:
+        # The command name may contain spaces; fields resume after its ')'
+        fields = f.read().rsplit(")", 1)[1].split()
+    return int(fields[1]), int(fields[19])
+
+
+def read_memory(pid):
+    """kB per FIELDS entry for pid."""
+    memory = dict.fromkeys(FIELDS, 0)
+    with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if name in memory:
+                memory[name] = int(rest.split()[0])
+    return memory
+
+
+def list_pids():
+    return [int(name) for name in os.listdir("/proc") if name.isdigit()]
+
+
+def read_pidfile(path=PIDFILE):
+    """The pid in path if that process is still running, else None."""
+    try:
+        with open(path, "r") as f:
+            pid = int(f.read().strip())
+        os.kill(pid, 0)
+    except (OSError, ValueError):
+        return None
+    return pid
+
+
+def find_master():
+    pid = read_pidfile()
+    if pid is not None:
+        return pid
+
+    # ppid and start time of every gunicorn process
+    processes = {}
+    for pid in list_pids():
+        if pid != os.getpid() and "gunicorn" in read_cmdline(pid):
+            try:
+                processes[pid] = read_stat(pid)
+            except OSError:
+                continue
+    children = dict.fromkeys(processes, 0)
+    for ppid, _ in processes.values():
+        if ppid in children:
+            children[ppid] += 1
+    # A wrapper has one gunicorn child (the master); on a tie the later-started
+    # process is the one further down the tree
+    candidates = [(count, processes[pid][1], pid) for pid, count in children.items() if count]
+    return max(candidates)[2] if candidates else None
+
+
+def find_workers(master):
+    workers = []
+    for pid in list_pids():
+        try:
+            if read_stat(pid)[0] == master:
+                workers.append(pid)
+        except OSError:
+            continue
+    return sorted(workers)
+
+
+def report(master):
+    rows = [("master", master)] + [("worker", pid) for pid in find_workers(master)]
+    print(f"{'':<8}{'pid':>8}" + "".join(f"{name:>15}" for name in FIELDS))
+    totals = dict.fromkeys(FIELDS, 0)
+    for role, pid in rows:
+        try:
+            memory = read_memory(pid)
+        except OSError as e:
+            print(f"{role:<8}{pid:>8}  unreadable: {e}")
+            continue
+        for name in FIELDS:
+            totals[name] += memory[name]
+        print(f"{role:<8}{pid:>8}" + "".join(f"{memory[name] / 1024:>12.1f} MB" for name in FIELDS))
+    print(f"{'total':<8}{'':>8}" + "".join(f"{totals[name] / 1024:>12.1f} MB" for name in FIELDS))
+
+
+if __name__ == "__main__":
+    master = int(sys.argv[1]) if len(sys.argv) > 1 else find_master()
+    if master is None:
+        sys.exit("No gunicorn master found; pass its pid")
+    report(master)
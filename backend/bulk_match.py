@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Bulk Quiz Matcher
+
+Re-ranks a file of stored quiz submissions against program_profiles.json,
+e.g. overnight after the profiles change. Submissions are read lazily,
+grouped into chunks and scored across a process pool with the same engine
+the API uses; each worker maps the compiled profile snapshot instead of
+parsing the JSON itself.
+
+Input (by extension):
+    .ndjson / .jsonl  one JSON object per line, either the raw answers or
+                      {"id": ..., "answers": {...}}
+    .csv              one submission per row, a column per answer key plus
+                      an optional id column; list answers (AA, LC, ALT, HS,
+                      SPT, CLB) are a JSON array or ";"-separated values
+
+Output (by extension):
+    .ndjson / .jsonl  {"id": ..., "matches": [...]} per submission, in input order,
+                      or {"id": ..., "error": "..."} for one that failed
+    .csv              id, rank, school, program, overall, academic, campus, social,
+                      error; a row per match, and for a failed submission a
+                      single row with only id and error filled in
+
+Usage:
+    python3 bulk_match.py submissions.ndjson results.ndjson [--top-k 10] [--workers N] [--chunk-size 256]
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import match_engine
+from match_me import PROGRAMS_PATH
+from profile_snapshot import load_program_matrix
+
+LIST_FIELDS = ("AA", "LC", "ALT", "HS", "SPT", "CLB")
+RESULT_FIELDS = ("school", "program", "overall", "academic", "campus", "social")
+
+
+def _is_csv(path):
+    return path.lower().endswith('.csv')
+
+
+def _csv_answers(row):
+    """Answers for one CSV row; ValueError if a cell can't be read."""
+    answers = {}
+    for key, value in row.items():
+        if key is None:
+            raise ValueError("more values than header columns")
+        if key == 'id' or value is None or value.strip() == '':
+            continue
+        value = value.strip()
+        if key in LIST_FIELDS:
+            value = json.loads(value) if value.startswith('[') else [item.strip() for item in value.split(';') if item.strip()]
+            if not isinstance(value, list):
+                raise ValueError(f"{key} must be a list")
+        answers[key] = value
+    return answers
+
+
+def _ndjson_submission(line, number):
+    """(id, answers) for one NDJSON line; ValueError if it isn't a submission object."""
+    record = json.loads(line.decode('utf-8'))
+    if not isinstance(record, dict):
+        raise ValueError(f"expected a JSON object, got {type(record).__name__}")
+    if isinstance(record.get('answers'), dict):
+        return record.get('id', number), record['answers']
+    return number, record
+
+
+def read_submissions(path):
+    """
+    Yield (id, answers, error) for every submission in path; ids default to
+    the 1-based record number. A record that can't be read comes back with
+    answers None and the reason in error, so one bad line doesn't end the run.
+    """
+    if _is_csv(path):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for number, row in enumerate(csv.DictReader(f), start=1):
+                submission_id = row.get('id') or number
+                try:
+                    yield submission_id, _csv_answers(row), None
+                except ValueError as e:
+                    yield submission_id, None, f"invalid record: {e}"
+        return
+
+    # Lines are decoded one at a time so bad bytes only affect their own record
+    with open(path, 'rb') as f:
+        number = 0
+        for line in f:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                submission_id, answers = _ndjson_submission(line, number)
+            except ValueError as e:
+                yield number, None, f"invalid record: {e}"
+                continue
+            yield submission_id, answers, None
+
+
+# Per-process program matrix, set by _init_worker
+_matrix = None
+
+
+def _init_worker(profiles_path):
+    global _matrix
+    _matrix = load_program_matrix(profiles_path)
+
+
+def score_chunk(chunk, top_k):
+    """(id, matches or None, error or None) for each submission in chunk."""
+    scored = []
+    for submission_id, answers, error in chunk:
+        if error is not None:
+            scored.append((submission_id, None, error))
+            continue
+        try:
+            scored.append((submission_id, match_engine.compute_matches(_matrix, answers, top_k), None))
+        except Exception as e:
+            scored.append((submission_id, None, str(e)))
+    return scored
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class ResultWriter:
+    """Writes scored submissions as NDJSON or CSV depending on the output path."""
+
+    def __init__(self, f, as_csv):
+        self.f = f
+        self.csv = csv.writer(f) if as_csv else None
+        if self.csv:
+            self.csv.writerow(("id", "rank") + RESULT_FIELDS + ("error",))
+
+    def write(self, submission_id, matches, error):
+        if self.csv is None:
+            record = {"id": submission_id, "matches": matches} if error is None else {"id": submission_id, "error": error}
+            self.f.write(json.dumps(record) + "\n")
+        elif error is None:
+            for rank, match in enumerate(matches, start=1):
+                self.csv.writerow((submission_id, rank) + tuple(match[field] for field in RESULT_FIELDS) + ("",))
+        else:
+            self.csv.writerow((submission_id, "") + ("",) * len(RESULT_FIELDS) + (error,))
+
+
+def run(input_path, output_path, top_k=10, workers=None, chunk_size=256, profiles_path=PROGRAMS_PATH):
+    """Score every submission in input_path into output_path; returns (submissions, failures, seconds)."""
+    workers = workers or os.cpu_count() or 1
+    submitted = failures = 0
+    start = time.perf_counter()
+
+    with open(output_path, 'w', encoding='utf-8', newline='') as out, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(profiles_path,)) as pool:
+        writer = ResultWriter(out, _is_csv(output_path))
+        # Keep a couple of chunks per worker in flight so the input is read
+        # lazily and results are written in input order as they complete
+        pending = deque()
+        for chunk in _chunks(read_submissions(input_path), chunk_size):
+            pending.append(pool.submit(score_chunk, chunk, top_k))
+            submitted += len(chunk)
+            while len(pending) >= workers * 2:
+                failures += _drain(pending.popleft(), writer)
+        while pending:
+            failures += _drain(pending.popleft(), writer)
+
+    return submitted, failures, time.perf_counter() - start
+
+
+def _drain(future, writer):
+    failures = 0
+    for submission_id, matches, error in future.result():
+        writer.write(submission_id, matches, error)
+        failures += error is not None
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank stored quiz submissions in bulk.")
+    parser.add_argument("input", help="submissions file (.ndjson/.jsonl or .csv)")
+    parser.add_argument("output", help="results file (.ndjson/.jsonl or .csv)")
+    parser.add_argument("--top-k", type=int, default=10, help="matches kept per submission (default 10)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="submissions per task (default 256)")
+    parser.add_argument("--profiles", default=PROGRAMS_PATH, help="program_profiles.json to rank against")
+    args = parser.parse_args(argv)
+
+    workers = args.workers or os.cpu_count() or 1
+    count, failures, elapsed = run(args.input, args.output, args.top_k, workers, args.chunk_size, args.profiles)
+
+    # Workers beyond the available cores share them, so divide by whichever is smaller
+    cores = min(workers, len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1)
+    rate = count / elapsed if elapsed else 0.0
+    print(f"Scored {count} submissions ({failures} failed) in {elapsed:.2f}s with {workers} workers on {cores} cores")
+    print(f"{rate:.0f} submissions/sec, {rate / cores:.0f} submissions/sec per core")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,10 @@
+import os
+import threading
+from bisect import bisect_right
+from collections import Counter, namedtuple
+from itertools import accumulate
+
+import numpy as np
 import pandas as pd
 import re
 
@@ -5,56 +12,339 @@ def clean_words(text):
     """Helper function to lowercase and tokenize words."""
     return set(re.findall(r'\b\w+\b', str(text).lower()))
 
-def match_ec_strength(user_ecs, notes_series, max_bonus=3):
+class NotesText:
     """
-    More flexible EC matching. Partial matches against full notes.
+    Lowercased notes of a group of rows joined into one string, so each EC
+    is located with a few str.find calls instead of a test against every note.
+    """
+
+    SEPARATOR = "\0"
+
+    def __init__(self, notes_lower):
+        self.notes = list(notes_lower)
+        self.text = self.SEPARATOR.join(self.notes)
+        # Offset just past the end of each note
+        self.ends = list(accumulate(len(note) + 1 for note in self.notes))
+
+    def count_containing(self, needle):
+        """Number of notes that contain needle."""
+        if not needle:
+            return len(self.notes)
+        if self.SEPARATOR in needle:
+            return sum(1 for note in self.notes if needle in note)
+
+        count = 0
+        pos = self.text.find(needle)
+        while pos != -1:
+            # Count the note holding this hit once, then resume at the next note
+            note_end = self.ends[bisect_right(self.ends, pos)]
+            count += 1
+            pos = self.text.find(needle, note_end)
+        return count
+
+class ECMatcher:
+    """
+    A user's ECs compiled once per request: lowercased, counted, and combined
+    into one regex that rules out notes with no EC at all in a single scan.
     """
-    match_count = 0
 
-    for note in notes_series.fillna(''):
-        note_lower = note.lower()
-        for ec in user_ecs:
-            if ec.lower() in note_lower:
-                match_count += 1
+    def __init__(self, user_ecs):
+        self.counts = Counter(ec.lower() for ec in user_ecs)
+        self.pattern = re.compile("|".join(re.escape(ec) for ec in self.counts))
 
+    def count_matches(self, notes_text):
+        """Number of (note, EC) pairs where the EC appears in the note."""
+        if not self.counts or not notes_text.notes or not self.pattern.search(notes_text.text):
+            return 0
+
+        match_count = 0
+        for ec, times in self.counts.items():
+            match_count += times * notes_text.count_containing(ec)
+        return match_count
+
+def count_ec_matches(user_ecs, notes_text):
+    return ECMatcher(user_ecs).count_matches(notes_text)
+
+def ec_bonus_for(user_ecs, match_count, max_bonus=3):
     base_bonus = 1 if len(user_ecs) >= 3 else 0
     flexible_bonus = match_count * 0.5
 
     total_bonus = min(base_bonus + flexible_bonus, max_bonus)
     return round(total_bonus, 1)
 
-def predict_admission_chance(csv_path, university, program_name, user_avg, user_ecs=None):
-    # Load CSV, skip metadata comment line
-    df = pd.read_csv(csv_path, skiprows=[1])
-    df.columns = df.columns.str.strip()
+def match_ec_strength(user_ecs, notes_series, max_bonus=3):
+    """
+    More flexible EC matching. Partial matches against full notes.
+    """
+    notes_text = NotesText(note.lower() for note in notes_series.fillna(''))
+    return ec_bonus_for(user_ecs, count_ec_matches(user_ecs, notes_text), max_bonus)
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class ProgramNameIndex:
+    """
+    Inverted trigram index over the program names of one group of rows.
+    search() returns the same rows as a case-insensitive substring match,
+    but only verifies names that share every trigram with the query.
+    """
+
+    def __init__(self, names, rows):
+        # Distinct lowercased names and the row positions that carry each one
+        name_rows = {}
+        for name, row in zip(names, rows):
+            if isinstance(name, str):
+                name_rows.setdefault(name, []).append(row)
+        self.names = list(name_rows)
+        self.rows = [np.array(r, dtype=np.intp) for r in name_rows.values()]
+
+        self.postings = {}
+        for name_id, name in enumerate(self.names):
+            for gram in trigrams(name):
+                self.postings.setdefault(gram, set()).add(name_id)
+
+    def candidates(self, query):
+        if len(query) < 3:
+            # Too short to have a trigram, check every distinct name
+            return range(len(self.names))
+
+        postings = []
+        for gram in trigrams(query):
+            ids = self.postings.get(gram)
+            if ids is None:
+                return ()
+            postings.append(ids)
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
+
+    def search(self, query):
+        """Row positions (in file order) whose name contains query (lowercased)."""
+        matched = [self.rows[i] for i in self.candidates(query) if query in self.names[i]]
+        if not matched:
+            return np.empty(0, dtype=np.intp)
+        if len(matched) == 1:
+            return matched[0]
+        return np.sort(np.concatenate(matched))
+
+# Offer statistics for one (university, program) query
+OfferStats = namedtuple("OfferStats", ["count", "mean", "min", "max", "supp_required", "notes", "notes_text"])
+
+class AdmissionsData:
+    """
+    Parsed admissionsData.csv plus lookup indexes, built once per file version.
+    """
+
+    def __init__(self, csv_path, mtime, source=None):
+        """source, if given, is a file object holding the CSV and is parsed instead of csv_path."""
+        self.csv_path = csv_path
+        self.mtime = mtime
+
+        # Load CSV, skip metadata comment line
+        df = pd.read_csv(csv_path if source is None else source, skiprows=[1])
+        df.columns = df.columns.str.strip()
+
+        # Clean numeric average values
+        df["Top 6 Average"] = pd.to_numeric(df["Top 6 Average"], errors="coerce")
+        df = df.dropna(subset=["Top 6 Average"]).reset_index(drop=True)
+        self.df = df
+
+        # Lowercased columns used for matching, computed once instead of per query
+        self.program_lower = df["Program name"].str.lower()
+
+        # Per-row supp flag and supp/comment notes used for EC scoring
+        self.supp_flags = df["Supp App?"].fillna('').str.strip().astype(bool)
+        self.notes = df["Notable info from supp app"].fillna('') + " " + df["Comments"].fillna('')
+        self.notes_lower = self.notes.str.lower().tolist()
+
+        # (university, decision) -> row positions, in file order
+        groups = df.groupby([df["University"].str.lower(), df["Decision"].str.lower()], sort=False)
+        self.rows_by_university_decision = groups.indices
+        self.program_indexes = {
+            key: ProgramNameIndex(self.program_lower.iloc[rows], rows)
+            for key, rows in self.rows_by_university_decision.items()
+        }
 
-    # Clean numeric average values
-    df["Top 6 Average"] = pd.to_numeric(df["Top 6 Average"], errors="coerce")
-    df = df.dropna(subset=["Top 6 Average"])
+        self.offer_stats_table = self._build_offer_stats_table()
 
-    # Match rows by partial (case-insensitive) substring match for program name
-    university_match = df["University"].str.lower() == university.lower()
-    program_match = df["Program name"].str.lower().str.contains(program_name.lower(), regex=False)
-    decision_match = df["Decision"].str.lower() == "offer"
+    def _build_offer_stats_table(self):
+        """
+        Materialize the stats for every (university, program name) that appears
+        in the offers, keyed by lowercased names. Each entry covers the same rows
+        the substring query for that program name would match.
+        """
+        table = {}
+        for (university, decision), index in self.program_indexes.items():
+            if decision != "offer":
+                continue
+            for name in index.names:
+                table[(university, name)] = self._offer_stats(index.search(name))
+        return table
 
-    offers = df[university_match & program_match & decision_match]
+    def _offer_stats(self, rows):
+        averages = self.df["Top 6 Average"].iloc[rows]
+        return OfferStats(
+            count=len(rows),
+            mean=averages.mean(),
+            min=averages.min(),
+            max=averages.max(),
+            supp_required=self.supp_flags.iloc[rows].any(),
+            notes=self.notes.iloc[rows],
+            notes_text=NotesText(self.notes_lower[row] for row in rows),
+        )
 
-    if offers.empty:
+    def find_offer_rows(self, university, program_name):
+        """Positions of offer rows at a university whose program name contains program_name."""
+        index = self.program_indexes.get((university.lower(), "offer"))
+        if index is None:
+            return np.empty(0, dtype=np.intp)
+
+        # Match rows by partial (case-insensitive) substring match for program name
+        return index.search(program_name.lower())
+
+    def find_offers(self, university, program_name):
+        """Offer rows at a university whose program name contains program_name."""
+        return self.df.iloc[self.find_offer_rows(university, program_name)]
+
+    def offer_stats(self, university, program_name):
+        """
+        Offer statistics for a query, or None if nothing matches. Exact program
+        names are answered from the precomputed table; anything else falls back
+        to the substring search.
+        """
+        stats = self.offer_stats_table.get((university.lower(), program_name.lower()))
+        if stats is not None:
+            return stats
+
+        rows = self.find_offer_rows(university, program_name)
+        if len(rows) == 0:
+            return None
+        return self._offer_stats(rows)
+
+
+_admissions_cache = {}
+_admissions_lock = threading.Lock()
+
+def load_admissions_data(csv_path):
+    """
+    Return the parsed admissions data for csv_path, re-reading the file only
+    when its modification time changes.
+    """
+    csv_path = os.path.abspath(csv_path)
+    mtime = os.stat(csv_path).st_mtime_ns
+
+    data = _admissions_cache.get(csv_path)
+    if data is not None and data.mtime == mtime:
+        return data
+
+    with _admissions_lock:
+        data = _admissions_cache.get(csv_path)
+        if data is None or data.mtime != mtime:
+            data = AdmissionsData(csv_path, mtime)
+            _admissions_cache[csv_path] = data
+    return data
+
+def _admissions(source):
+    """AdmissionsData for a CSV path, or source itself if it is already loaded."""
+    return source if isinstance(source, AdmissionsData) else load_admissions_data(source)
+
+class AdmissionResult:
+    """
+    Outcome of one chance-me query as plain numbers. Use
+    render_admission_result for the text shown to users.
+    """
+
+    __slots__ = (
+        "university", "program", "user_avg", "ec_bonus", "adjusted_avg",
+        "score", "verdict", "avg_accept", "min_accept", "max_accept",
+        "supp_required", "sample_count",
+    )
+
+    def __init__(self, university, program, user_avg, ec_bonus=0, adjusted_avg=None,
+                 score=None, verdict=None, avg_accept=None, min_accept=None,
+                 max_accept=None, supp_required=False, sample_count=0):
+        self.university = university
+        self.program = program
+        self.user_avg = user_avg
+        self.ec_bonus = ec_bonus
+        self.adjusted_avg = adjusted_avg
+        self.score = score
+        self.verdict = verdict
+        self.avg_accept = avg_accept
+        self.min_accept = min_accept
+        self.max_accept = max_accept
+        self.supp_required = supp_required
+        self.sample_count = sample_count
+
+    @property
+    def found(self):
+        return self.sample_count > 0
+
+    def to_dict(self):
+        """JSON-ready fields (numpy scalars converted to Python types)."""
+        def plain(value):
+            return value.item() if isinstance(value, np.generic) else value
+        return {name: plain(getattr(self, name)) for name in self.__slots__}
+
+def render_admission_result(result):
+    """Format an AdmissionResult as the chance-me summary text."""
+    if not result.found:
         return "⚠️ No offer data found for that program."
 
-    avg_accept = offers["Top 6 Average"].mean()
-    min_accept = offers["Top 6 Average"].min()
-    max_accept = offers["Top 6 Average"].max()
+    return f"""
+🎓 Program: {result.program} at {result.university}
+📑 Supplementary App Required: {'Yes' if result.supp_required else 'No'}
+📈 Your average: {result.user_avg}% + EC bonus ({result.ec_bonus}%) → {result.adjusted_avg:.1f}%
+📊 Past offers average: {result.avg_accept:.1f}%
+🔎 Offer range: {result.min_accept:.1f}% – {result.max_accept:.1f}%
+🎯 Predicted chance: {result.score}%
+"""
+
+def predict_admission_chance(csv_path, university, program_name, user_avg, user_ecs=None):
+    """
+    Predict the chance of an offer; returns an AdmissionResult. csv_path may
+    also be an AdmissionsData that is already loaded.
+    """
+    stats = _admissions(csv_path).offer_stats(university, program_name)
+    ec_matcher = ECMatcher(user_ecs) if user_ecs else None
+    return _predict_from_stats(stats, university, program_name, user_avg, user_ecs, ec_matcher)
+
+def predict_admission_chance_batch(csv_path, queries, user_avg, user_ecs=None):
+    """
+    Predict chances for many (university, program) pairs that share one average
+    and EC list. The data is looked up and the ECs compiled once for the whole
+    batch, and repeated pairs are only scored once.
+
+    Returns one AdmissionResult per pair, in the order given.
+    """
+    data = _admissions(csv_path)
+    ec_matcher = ECMatcher(user_ecs) if user_ecs else None
+
+    predictions = {}
+    results = []
+    for university, program_name in queries:
+        key = (university, program_name)
+        if key not in predictions:
+            stats = data.offer_stats(university, program_name)
+            predictions[key] = _predict_from_stats(stats, university, program_name, user_avg, user_ecs, ec_matcher)
+        results.append(predictions[key])
+    return results
+
+def _predict_from_stats(stats, university, program_name, user_avg, user_ecs, ec_matcher):
+    if stats is None:
+        return AdmissionResult(university, program_name, user_avg)
+
+    avg_accept = stats.mean
+    min_accept = stats.min
+    max_accept = stats.max
 
     # Check for supp app
-    supp_required = offers["Supp App?"].fillna('').str.strip().astype(bool).any()
+    supp_required = stats.supp_required
 
 
     # EC scoring
     ec_bonus = 0
     if supp_required and user_ecs:
-        combined_notes = offers["Notable info from supp app"].fillna('') + " " + offers["Comments"].fillna('')
-        ec_bonus = match_ec_strength(user_ecs, combined_notes)
+        ec_bonus = ec_bonus_for(user_ecs, ec_matcher.count_matches(stats.notes_text))
 
     adjusted_avg = user_avg + ec_bonus
 
@@ -62,28 +352,31 @@ def predict_admission_chance(csv_path, university, program_name, user_avg, user_
         # Calculate prediction score
     if adjusted_avg >= max_accept:
         score = 95 + ((adjusted_avg - max_accept) / 5) * 5  # small bonus if far above max
-        verdict = "✅ Very likely"
+        verdict = "Very likely"
     elif adjusted_avg >= avg_accept:
         score = 75 + ((adjusted_avg - avg_accept) / (max_accept - avg_accept)) * 19
-        verdict = "✅ Likely"
+        verdict = "Likely"
     elif adjusted_avg >= min_accept:
         score = 50 + ((adjusted_avg - min_accept) / (avg_accept - min_accept)) * 24
-        verdict = "⚠️ Possible, but below average"
+        verdict = "Possible, but below average"
     else:
         score = max(10, (adjusted_avg / min_accept) * 40)  # still give a small score
-        verdict = "❌ Unlikely"
+        verdict = "Unlikely"
 
     score = min(round(score, 1), 100)
 
-
-    return f"""
-🎓 Program: {program_name} at {university}
-📑 Supplementary App Required: {'Yes' if supp_required else 'No'}
-📈 Your average: {user_avg}% + EC bonus ({ec_bonus}%) → {adjusted_avg:.1f}%
-📊 Past offers average: {avg_accept:.1f}%
-🔎 Offer range: {min_accept:.1f}% – {max_accept:.1f}%
-🎯 Predicted chance: {score}%
-"""
+    return AdmissionResult(
+        university, program_name, user_avg,
+        ec_bonus=ec_bonus,
+        adjusted_avg=adjusted_avg,
+        score=score,
+        verdict=verdict,
+        avg_accept=avg_accept,
+        min_accept=min_accept,
+        max_accept=max_accept,
+        supp_required=supp_required,
+        sample_count=stats.count,
+    )
 
 
 # === Example Usage ===
@@ -94,4 +387,4 @@ if __name__ == "__main__":
     top6 = 93
     ecs = ["robotics", "student council", "volunteering"]
 
-    print(predict_admission_chance(csv_file, university, program, top6, ecs))
+    print(render_admission_result(predict_admission_chance(csv_file, university, program, top6, ecs)))
@@ -0,0 +1,225 @@
+"""
+Versioned registry of the API's data files.
+
+program_profiles.json, mentors.json and admissionsData.csv are each built
+into their read-only form (ProgramMatrix, MentorIndex, AdmissionsData) and
+published together as one immutable DataSnapshot. A background thread polls
+the files' mtimes; when one changes and its checksum really differs, only
+that source is rebuilt, off the request path, and a new snapshot replaces
+the old one with a single reference assignment. A request that grabbed the
+previous snapshot keeps using it until it finishes, so nothing ever sees a
+half-built state.
+
+Every snapshot has a version string derived from the three checksums,
+which the API returns in responses.
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+
+from chanceMe import AdmissionsData
+from mentors import MENTORS_PATH, MentorIndex
+from profile_snapshot import program_matrix_from_bytes
+
+logger = logging.getLogger("unime.data")
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_FILES = {
+    "programs": os.path.join(BACKEND_DIR, 'program_profiles.json'),
+    "mentors": MENTORS_PATH,
+    "admissions": os.path.join(BACKEND_DIR, 'admissionsData.csv'),
+}
+# Seconds between checks of the files' modification times
+POLL_INTERVAL = float(os.environ.get("DATA_POLL_INTERVAL", "2"))
+
+
+class SourceState:
+    """What a source was last built from: stat fingerprint and content checksum."""
+
+    __slots__ = ("path", "mtime", "size", "checksum")
+
+    def __init__(self, path, mtime, size, checksum):
+        self.path = path
+        self.mtime = mtime
+        self.size = size
+        self.checksum = checksum
+
+    def to_dict(self):
+        return {"mtime_ns": self.mtime, "size": self.size, "checksum": self.checksum}
+
+
+class DataSnapshot:
+    """One consistent set of loaded data. Never modified after it is published."""
+
+    def __init__(self, programs, mentors, admissions, sources):
+        self.programs = programs
+        self.mentors = mentors
+        self.admissions = admissions
+        self.sources = sources
+        digest = hashlib.sha1()
+        for name in sorted(sources):
+            digest.update(f"{name}:{sources[name].checksum};".encode('utf-8'))
+        self.version = digest.hexdigest()[:12]
+
+    def describe(self):
+        return {
+            "version": self.version,
+            "sources": {name: state.to_dict() for name, state in self.sources.items()},
+        }
+
+
+def _fingerprint(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return (None, None)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _read_source(path):
+    """(bytes, SourceState) for path, or (None, state with no checksum) when it is missing."""
+    try:
+        stat = os.stat(path)
+        with open(path, 'rb') as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return None, SourceState(path, None, None, None)
+    return raw, SourceState(path, stat.st_mtime_ns, stat.st_size, hashlib.sha1(raw).hexdigest())
+
+
+# Builders work from the bytes that were checksummed, never by re-reading
+# the path, so a version always describes the data that was actually loaded
+
+def _build_programs(path, raw, state):
+    return program_matrix_from_bytes(raw, path)
+
+
+def _build_mentors(path, raw, state):
+    if raw is None:
+        logger.warning("Mentors file %s not found; serving no mentors", path)
+        return MentorIndex({}, state.mtime)
+    return MentorIndex(json.loads(raw), state.mtime)
+
+
+def _build_admissions(path, raw, state):
+    if raw is None:
+        # Only chance-me needs it; everything else keeps working
+        logger.warning("Admissions file %s not found; chance-me is unavailable", path)
+        return None
+    return AdmissionsData(path, state.mtime, io.BytesIO(raw))
+
+
+BUILDERS = {
+    "programs": _build_programs,
+    "mentors": _build_mentors,
+    "admissions": _build_admissions,
+}
+
+
+class DataRegistry:
+    """
+    Holds the current DataSnapshot and rebuilds it when the files change.
+
+    current is safe to read from any thread at any time. The watcher thread
+    is started per process by ensure_watching(), so a gunicorn master can
+    load the data, fork, and each worker then watches on its own.
+    """
+
+    def __init__(self, files=DATA_FILES, interval=POLL_INTERVAL):
+        self.files = dict(files)
+        self.interval = interval
+        self.current = None
+        self._seen = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._thread_pid = None
+
+    def on_swap(self, listener):
+        """Call listener(old, new) after each new snapshot is published."""
+        self._listeners.append(listener)
+
+    def load(self):
+        """Build every source now (blocking) unless already loaded; returns the snapshot."""
+        with self._lock:
+            if self.current is None:
+                parts = {}
+                sources = {}
+                for name, path in self.files.items():
+                    raw, state = _read_source(path)
+                    parts[name] = BUILDERS[name](path, raw, state)
+                    sources[name] = state
+                    self._seen[name] = (state.mtime, state.size)
+                self._publish(DataSnapshot(sources=sources, **parts))
+        return self.current
+
+    def refresh(self):
+        """
+        Rebuild the sources whose content changed since the current snapshot
+        and publish the result. Returns True if a new snapshot was published.
+        """
+        with self._lock:
+            snapshot = self.current
+            if snapshot is None:
+                return False
+
+            changed = {}
+            for name, path in self.files.items():
+                if _fingerprint(path) == self._seen.get(name):
+                    continue
+                raw, state = _read_source(path)
+                # From here on this file version counts as seen, whether it was
+                # only touched, rebuilds fine or fails to build
+                self._seen[name] = (state.mtime, state.size)
+                if state.checksum != snapshot.sources[name].checksum:
+                    changed[name] = (raw, state)
+
+            parts = {"programs": snapshot.programs, "mentors": snapshot.mentors, "admissions": snapshot.admissions}
+            sources = dict(snapshot.sources)
+            for name, (raw, state) in changed.items():
+                try:
+                    parts[name] = BUILDERS[name](self.files[name], raw, state)
+                except Exception as e:
+                    # Keep serving the old data; the file is tried again once it changes
+                    # (a half-written file gets a new mtime when the write completes)
+                    logger.error("Could not reload %s: %s", self.files[name], e)
+                    continue
+                sources[name] = state
+
+            rebuilt = sorted(name for name in changed if sources[name] is not snapshot.sources[name])
+            if not rebuilt:
+                return False
+            self._publish(DataSnapshot(sources=sources, **parts))
+            logger.info("Data reloaded (%s): version %s", ", ".join(rebuilt), self.current.version)
+            return True
+
+    def _publish(self, snapshot):
+        old, self.current = self.current, snapshot
+        for listener in self._listeners:
+            listener(old, snapshot)
+
+    def ensure_watching(self):
+        """Start the watcher thread in this process if it isn't running yet."""
+        if self._thread_pid == os.getpid() or self.interval <= 0:
+            return
+        with self._lock:
+            if self._thread_pid == os.getpid():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name="data-registry", daemon=True)
+            self._thread_pid = os.getpid()
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error("Data registry check failed: %s", e)
@@ -0,0 +1,29 @@
+"""
+Gunicorn settings for the backend API.
+
+    cd backend && gunicorn -c gunicorn.conf.py
+
+The app is built once in the master (preload_app) by api.create_app() and
+the workers are forked from it, so program profiles, admissions stats and
+mentors are loaded a single time and shared copy-on-write.
+"""
+import gc
+import logging
+import multiprocessing
+import os
+
+wsgi_app = "api:create_app()"
+preload_app = True
+
+bind = os.environ.get("BIND", "0.0.0.0:5001")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+# Master pid, read by benchmarks/worker_memory.py
+pidfile = os.environ.get("GUNICORN_PIDFILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "gunicorn.pid"))
+
+# App logging (errors, sampled request debug lines; see metrics.py)
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"))
+
+# No collections in the master while the shared data is being built, so it
+# isn't left full of freed holes; create_app() freezes the heap and turns
+# collection back on before any worker is forked.
+gc.disable()
@@ -0,0 +1,653 @@
+"""
+Vectorized scoring engine for the program matcher.
+
+program_profiles.json is compiled once into column arrays: numeric academic
+and social attributes as float arrays, categorical campus fields as integer
+codes, and list fields (sports, clubs, housing, alternatives) as bitsets.
+Scoring a quiz submission against every program is then a handful of NumPy
+operations instead of a Python loop over ~1,400 dicts.
+
+This is the one scoring path for both the Flask app and the match_me CLI.
+The arithmetic mirrors the per-program reference functions in match_me.py
+step for step, so scores agree with them to the last bit;
+benchmarks/check_parity.py verifies that.
+"""
+import hashlib
+import json
+import sys
+
+import numpy as np
+
+from match_me import (
+    ACADEMIC_ANSWERS, ACADEMIC_KEYS, COURSE_CATEGORIES, COURSE_MAPPINGS,
+    INTEREST_CATEGORIES, INTEREST_MAPPINGS, academic_weights, resolve_term,
+)
+
+URBAN_SUBURBAN = {"Urban", "Suburban"}
+RURAL_SMALL = {"Small-town", "Rural"}
+CAMPUS_SIZES = ["Small", "Medium", "Large"]
+
+# Interest score by number of distinct matches (3 or more score 1.0)
+INTEREST_SCORES = np.array([0, 0.6, 0.8, 1.0])
+
+
+WEIGHT_KEYS = ("wa", "wc", "wso", "W_TOTAL")
+
+
+def normalize_weights(answers):
+    """The wa/wc/wso weights (default 1 each) and their total, as floats."""
+    wa = float(answers.get("wa", 1))
+    wc = float(answers.get("wc", 1))
+    wso = float(answers.get("wso", 1))
+    return {"wa": wa, "wc": wc, "wso": wso, "W_TOTAL": wa + wc + wso}
+
+
+def normalize_answers(answers):
+    """Parse raw quiz answers from the frontend into typed values."""
+    return {
+        **normalize_weights(answers),
+        "AA": answers.get("AA", []),
+        "LS": int(answers.get("LS", 3)),
+        "SP": int(answers.get("SP", 3)),
+        "CO": int(answers.get("CO", 3)),
+        "UR": int(answers.get("UR", 3)),
+        "CR": int(answers.get("CR", 3)),
+        "CE": int(answers.get("CE", 3)),
+        "LC": answers.get("LC", []),
+        "ME": int(answers.get("ME", 3)),
+        "CP": int(answers.get("CP", 3)),
+        "ALT": answers.get("ALT", []),
+        "CSB": answers.get("CSB", ""),
+        "SET": answers.get("SET", ""),
+        "HS": set(answers.get("HS", [])),
+        "CPS": answers.get("CPS", ""),
+        "NS": int(answers.get("NS", 3)),
+        "SPT": set(answers.get("SPT", [])),
+        "CLB": set(answers.get("CLB", [])),
+        "CEV": int(answers.get("CEV", 3)),
+    }
+
+
+def answers_key(answers):
+    """
+    Canonical hash of normalized answers. Scoring only depends on which items
+    are picked (and how many), not their order, so list fields are sorted.
+    """
+    canonical = {
+        key: sorted(value, key=repr) if isinstance(value, (list, set)) else value
+        for key, value in answers.items()
+    }
+    payload = json.dumps(canonical, sort_keys=True, default=repr)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def components_key(answers):
+    """
+    Hash of everything but the weights: answer sets that only differ in
+    wa/wc/wso share their academic, campus and social score vectors.
+    """
+    return answers_key({key: value for key, value in answers.items() if key not in WEIGHT_KEYS})
+
+
+class Codes:
+    """A categorical field stored as one integer code per program."""
+
+    def __init__(self, values):
+        self.vocab = {}
+        self.codes = np.array([self.vocab.setdefault(v, len(self.vocab)) for v in values], dtype=np.int32)
+
+    def code(self, value):
+        try:
+            return self.vocab.get(value, -1)
+        except TypeError:
+            return -1
+
+    def equals(self, value):
+        return self.codes == self.code(value)
+
+    def isin(self, values):
+        return np.isin(self.codes, [self.vocab[v] for v in values if v in self.vocab])
+
+    def equals_each(self, values):
+        """(len(values) × programs) version of equals: row r is equals(values[r])."""
+        return self.codes[None, :] == np.array([self.code(v) for v in values], dtype=np.int64)[:, None]
+
+    def dump(self, name, arrays, tables):
+        arrays[name] = self.codes
+        tables[name] = list(self.vocab)
+
+    @classmethod
+    def restore(cls, name, arrays, tables):
+        self = cls.__new__(cls)
+        self.vocab = {v: i for i, v in enumerate(tables[name])}
+        self.codes = arrays[name]
+        return self
+
+
+class Bitsets:
+    """A list field stored as a row of uint64 bitset words per program."""
+
+    def __init__(self, lists):
+        self.vocab = {}
+        for items in lists:
+            for item in items:
+                self.vocab.setdefault(item, len(self.vocab))
+
+        words = max(1, (len(self.vocab) + 63) // 64)
+        masks = [self._mask_int(items) for items in lists]
+        self.bits = np.array(
+            [[(m >> (64 * w)) & 0xFFFFFFFFFFFFFFFF for w in range(words)] for m in masks],
+            dtype=np.uint64,
+        ).reshape(len(lists), words)
+        self.nonempty = self.bits.any(axis=1)
+
+    def _mask_int(self, items):
+        mask = 0
+        for item in items:
+            bit = self.vocab.get(item)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def mask(self, items):
+        m = self._mask_int(items)
+        return np.array([(m >> (64 * w)) & 0xFFFFFFFFFFFFFFFF for w in range(self.bits.shape[1])], dtype=np.uint64)
+
+    def count_common(self, items):
+        """Size of the intersection of each program's list with items."""
+        return np.bitwise_count(self.bits & self.mask(items)).sum(axis=1, dtype=np.int64)
+
+    def count_common_each(self, item_lists):
+        """
+        (len(item_lists) × programs) version of count_common. Only the bits
+        some user picked are unpacked, into a (programs × picked) 0/1 matrix;
+        one matrix product with the users' 0/1 picks then gives every count.
+        """
+        columns = {}
+        picks = []
+        for row, items in enumerate(item_lists):
+            for item in items:
+                bit = self.vocab.get(item)
+                if bit is not None:
+                    picks.append((row, columns.setdefault(bit, len(columns))))
+
+        if not columns:
+            return np.zeros((len(item_lists), len(self.bits)), dtype=np.int64)
+        bits = np.fromiter(columns, dtype=np.uint64, count=len(columns))
+        members = (self.bits[:, (bits // np.uint64(64)).astype(np.intp)] >> (bits % np.uint64(64))) & np.uint64(1)
+        users = np.zeros((len(item_lists), len(columns)))
+        rows, cols = zip(*picks)
+        users[rows, cols] = 1.0
+        # Counts are small integers, exact in float64
+        return np.rint(users @ members.astype(np.float64).T).astype(np.int64)
+
+    def dump(self, name, arrays, tables):
+        arrays[name] = self.bits
+        tables[name] = list(self.vocab)
+
+    @classmethod
+    def restore(cls, name, arrays, tables):
+        self = cls.__new__(cls)
+        self.vocab = {v: i for i, v in enumerate(tables[name])}
+        self.bits = arrays[name]
+        self.nonempty = self.bits.any(axis=1)
+        return self
+
+
+class TermMatcher:
+    """
+    Program interests (or liked courses) resolved against a keyword mapping.
+
+    Like enhanced_interest_score, a program term counts as its own lowercased
+    text when the user picked it directly, otherwise as the first category (in
+    mapping order) whose keyword it contains and that the user picked. Each
+    distinct term's candidate categories come from match_me.resolve_term and
+    are turned into integer ids once here.
+    """
+
+    def __init__(self, term_lists, mappings, resolved):
+        self.category_ids = {}
+        for category in mappings.values():
+            self.category_ids.setdefault(category, len(self.category_ids))
+
+        self.lower_ids = {}
+        term_ids = {}
+        term_lower = []
+        term_categories = []
+        program_index = []
+        term_index = []
+        for p, terms in enumerate(term_lists):
+            for term in terms:
+                tid = term_ids.get(term)
+                if tid is None:
+                    tid = term_ids[term] = len(term_ids)
+                    lower, categories = resolve_term(term, mappings, resolved)
+                    term_lower.append(self.lower_ids.setdefault(lower, len(self.lower_ids)))
+                    term_categories.append([self.category_ids[c] for c in categories])
+                program_index.append(p)
+                term_index.append(tid)
+
+        # Candidate categories per distinct term, padded with a "never picked" slot
+        width = max([1] + [len(c) for c in term_categories])
+        self.term_categories = np.full((len(term_ids), width), len(self.category_ids), dtype=np.int32)
+        for tid, categories in enumerate(term_categories):
+            self.term_categories[tid, :len(categories)] = categories
+
+        self.term_lower = np.array(term_lower, dtype=np.int64)
+        self.program_index = np.array(program_index, dtype=np.int64)
+        self.term_index = np.array(term_index, dtype=np.int64)
+        self.size = len(term_lists)
+
+    def match_counts(self, user_terms):
+        """Number of distinct matched terms/categories for every program."""
+        direct = np.zeros(len(self.lower_ids), dtype=bool)
+        for lower in {t.lower() for t in user_terms}:
+            lid = self.lower_ids.get(lower)
+            if lid is not None:
+                direct[lid] = True
+
+        picked = np.zeros(len(self.category_ids) + 1, dtype=bool)
+        for term in user_terms:
+            cid = self.category_ids.get(term)
+            if cid is not None:
+                picked[cid] = True
+
+        # First picked category per term, then the token each term contributes
+        hits = picked[self.term_categories]
+        first = self.term_categories[np.arange(len(hits)), hits.argmax(axis=1)]
+        n_lower = len(self.lower_ids)
+        token = np.where(direct[self.term_lower], self.term_lower,
+                         np.where(hits.any(axis=1), n_lower + first, -1))
+
+        tokens = token[self.term_index]
+        keep = tokens >= 0
+        n_tokens = n_lower + len(self.category_ids)
+        pairs = np.unique(self.program_index[keep] * n_tokens + tokens[keep])
+        return np.bincount(pairs // n_tokens, minlength=self.size)
+
+    def match_counts_each(self, user_term_lists):
+        """
+        (len(user_term_lists) × programs) version of match_counts. Only the
+        user's own direct terms and the categories can be tokens, so each
+        user's tokens fit in one 64-bit mask: every term becomes a bit, the
+        bits are OR-ed per program and the distinct count is a popcount.
+        """
+        n = len(user_term_lists)
+        n_categories = len(self.category_ids)
+        # Bit per token: categories first, then each user's direct terms
+        direct_bit = np.full((n, len(self.lower_ids)), -1, dtype=np.int64)
+        picked = np.zeros((n, n_categories + 1), dtype=bool)
+        for row, user_terms in enumerate(user_term_lists):
+            lids = sorted({self.lower_ids[lower] for lower in {t.lower() for t in user_terms} if lower in self.lower_ids})
+            if n_categories + len(lids) > 64:
+                return np.array([self.match_counts(terms) for terms in user_term_lists]).reshape(n, self.size)
+            direct_bit[row, lids] = np.arange(n_categories, n_categories + len(lids))
+            for term in user_terms:
+                cid = self.category_ids.get(term)
+                if cid is not None:
+                    picked[row, cid] = True
+
+        # Laid out (terms × users) so the per-program reduction runs over rows.
+        # Each term's bit: its direct token if the user picked it, else the
+        # first of its categories the user picked (checked in reverse so the
+        # earliest wins), else none
+        picked_t = picked.T
+        bit = np.full((len(self.term_categories), n), -1, dtype=np.int64)
+        for w in range(self.term_categories.shape[1] - 1, -1, -1):
+            categories = self.term_categories[:, w]
+            bit = np.where(picked_t[categories], categories[:, None], bit)
+        direct = direct_bit.T[self.term_lower]
+        bit = np.where(direct >= 0, direct, bit)
+        term_bits = np.where(bit >= 0, np.left_shift(np.uint64(1), np.maximum(bit, 0).astype(np.uint64)), np.uint64(0))
+
+        counts = np.zeros((self.size, n), dtype=np.int64)
+        if len(self.program_index):
+            # Occurrences are stored program by program; OR each program's run
+            starts = np.flatnonzero(np.r_[True, self.program_index[1:] != self.program_index[:-1]])
+            merged = np.bitwise_or.reduceat(term_bits[self.term_index], starts, axis=0)
+            counts[self.program_index[starts]] = np.bitwise_count(merged)
+        return counts.T
+
+    ARRAYS = ('term_categories', 'term_lower', 'program_index', 'term_index')
+
+    def dump(self, name, arrays, tables):
+        for attr in self.ARRAYS:
+            arrays[f"{name}.{attr}"] = getattr(self, attr)
+        tables[name] = {"categories": list(self.category_ids), "lower": list(self.lower_ids), "size": self.size}
+
+    @classmethod
+    def restore(cls, name, arrays, tables):
+        self = cls.__new__(cls)
+        for attr in cls.ARRAYS:
+            setattr(self, attr, arrays[f"{name}.{attr}"])
+        self.category_ids = {c: i for i, c in enumerate(tables[name]["categories"])}
+        self.lower_ids = {t: i for i, t in enumerate(tables[name]["lower"])}
+        self.size = tables[name]["size"]
+        return self
+
+
+class ProgramMatrix:
+    """program_profiles.json compiled into column arrays."""
+
+    def __init__(self, programs, version=None):
+        # Identifies the profile data the arrays were built from
+        self.version = version
+        self.size = len(programs)
+        self.schools = [p['uni'] for p in programs]
+        self.programs = [p['program'] for p in programs]
+
+        academic = [p['academic'] for p in programs]
+        campus = [p['campus'] for p in programs]
+        social = [p['social'] for p in programs]
+
+        # One row per numeric attribute so each column slice is contiguous
+        self.academic = np.array([[a.get(k, 3) for a in academic] for k in ACADEMIC_KEYS], dtype=float)
+        self.interests = TermMatcher([a['interests'] for a in academic], INTEREST_MAPPINGS, INTEREST_CATEGORIES)
+        self.courses = TermMatcher([a.get('liked_hs_courses', []) for a in academic], COURSE_MAPPINGS, COURSE_CATEGORIES)
+        self.alt = Bitsets([a.get('alt_to_engineering', []) for a in academic])
+
+        self.class_size = Codes([c.get('class_size_bin') for c in campus])
+        self.setting = Codes([c.get('setting') for c in campus])
+        self.housing = Bitsets([c.get('housing_styles', []) for c in campus])
+        self.campus_size = Codes([c.get('campus_size') for c in campus])
+        self.campus_size_rank = np.array(
+            [CAMPUS_SIZES.index(c.get('campus_size')) if c.get('campus_size') in CAMPUS_SIZES else -1 for c in campus],
+            dtype=np.int32,
+        )
+
+        self.night_scene = np.array([s.get('night_scene', 3) for s in social], dtype=float)
+        self.sports = Bitsets([s.get('sports', []) for s in social])
+        self.clubs = Bitsets([s.get('clubs', []) for s in social])
+        self.cultural_event_freq = np.array([s.get('cultural_event_freq', 3) for s in social], dtype=float)
+
+    # Plain array attributes and the compiled fields, by type, for dump/restore
+    ARRAYS = ('academic', 'campus_size_rank', 'night_scene', 'cultural_event_freq')
+    FIELDS = (
+        ('interests', TermMatcher), ('courses', TermMatcher), ('alt', Bitsets),
+        ('class_size', Codes), ('setting', Codes), ('housing', Bitsets),
+        ('campus_size', Codes), ('sports', Bitsets), ('clubs', Bitsets),
+    )
+
+    def dump(self):
+        """
+        The matrix as named arrays plus JSON-able tables. School and program
+        names are stored once in a string table and referenced by index.
+        """
+        arrays = {attr: getattr(self, attr) for attr in self.ARRAYS}
+        tables = {}
+        for name, kind in self.FIELDS:
+            getattr(self, name).dump(name, arrays, tables)
+
+        strings = {}
+        arrays['school_ids'] = np.array([strings.setdefault(v, len(strings)) for v in self.schools], dtype=np.int32)
+        arrays['program_ids'] = np.array([strings.setdefault(v, len(strings)) for v in self.programs], dtype=np.int32)
+        tables['strings'] = list(strings)
+        tables['size'] = self.size
+        return arrays, tables
+
+    @classmethod
+    def restore(cls, arrays, tables, version=None):
+        """Rebuild a matrix from dump() output without the source profiles."""
+        self = cls.__new__(cls)
+        self.version = version
+        self.size = tables['size']
+        strings = [sys.intern(v) for v in tables['strings']]
+        self.schools = [strings[i] for i in arrays['school_ids']]
+        self.programs = [strings[i] for i in arrays['program_ids']]
+        for attr in cls.ARRAYS:
+            setattr(self, attr, arrays[attr])
+        for name, kind in cls.FIELDS:
+            setattr(self, name, kind.restore(name, arrays, tables))
+        return self
+
+
+def academic_scores(matrix, answers):
+    AA, LC, ALT = answers['AA'], answers['LC'], answers['ALT']
+
+    # interests (weighted 40%)
+    if AA:
+        i_score = INTEREST_SCORES[np.minimum(matrix.interests.match_counts(AA), 3)] * 0.4
+    else:
+        i_score = 0
+
+    # courses (weighted 20%)
+    if LC:
+        ratio = matrix.courses.match_counts(LC) / max(len(LC), 1)
+        lc_score = np.minimum(ratio, 1.0) * 0.2
+    else:
+        lc_score = 0
+
+    # alt (weighted 10%)
+    if ALT:
+        alt_score = (matrix.alt.count_common(set(ALT)) / max(len(ALT), 1)) * 0.1
+    else:
+        alt_score = 0
+
+    # numeric (weighted 30%)
+    weights, total_weight = academic_weights(answers)
+    num_sum = 0
+    for column, key, weight in zip(matrix.academic, ACADEMIC_ANSWERS, weights):
+        num_sum = num_sum + (1 - (np.abs(column - answers[key]) / 4.0)) * weight
+    num_score = num_sum / total_weight * 0.3
+
+    return i_score + lc_score + num_score + alt_score
+
+
+def campus_scores(matrix, answers):
+    CSB, SET, HS, CPS = answers['CSB'], answers['SET'], answers['HS'], answers['CPS']
+
+    # Class size, with partial credit next to the middle bin
+    class_size = np.where(matrix.class_size.equals(CSB), 1.0, 0.0)
+    if CSB in ("< 60", "200+"):
+        class_size[matrix.class_size.equals("60-200")] = 0.5
+
+    # Setting, with partial credit for related settings
+    setting = np.where(matrix.setting.equals(SET), 1.0, 0.0)
+    for related in (URBAN_SUBURBAN, RURAL_SMALL):
+        if SET in related:
+            setting[(setting == 0.0) & matrix.setting.isin(related)] = 0.5
+
+    # Housing: share of the user's preferences that are available
+    if HS:
+        housing = np.where(matrix.housing.nonempty, matrix.housing.count_common(HS) / len(HS), 0.0)
+    else:
+        housing = np.zeros(matrix.size)
+
+    # Campus size, with partial credit one size away
+    campus_size = np.where(matrix.campus_size.equals(CPS), 1.0, 0.0)
+    if CPS in CAMPUS_SIZES:
+        near = (matrix.campus_size_rank != -1) & (np.abs(matrix.campus_size_rank - CAMPUS_SIZES.index(CPS)) == 1)
+        campus_size[(campus_size == 0.0) & near] = 0.5
+
+    return (class_size + setting + housing + campus_size) / 4
+
+
+def social_scores(matrix, answers):
+    SPT, CLB = answers['SPT'], answers['CLB']
+
+    ns_score = 1 - (np.abs(matrix.night_scene - answers['NS']) / 4.0)
+
+    if "None" in SPT:
+        spt_score = 1.0
+    else:
+        spt_score = matrix.sports.count_common(SPT) / max(len(SPT), 1)
+
+    if CLB:
+        cl_score = matrix.clubs.count_common(CLB) / max(len(CLB), 1)
+    else:
+        cl_score = 0.5
+
+    cev_score = 1 - (np.abs(matrix.cultural_event_freq - answers['CEV']) / 4.0)
+
+    return (ns_score + spt_score + cl_score + cev_score) / 4
+
+
+def component_scores(matrix, answers):
+    """Academic, campus and social score arrays; these don't depend on the weights."""
+    return academic_scores(matrix, answers), campus_scores(matrix, answers), social_scores(matrix, answers)
+
+
+def weigh_components(components, weights):
+    """
+    (total, a, c, s) from component_scores output and normalized weights,
+    i.e. score_programs without recomputing the components.
+    """
+    if weights['W_TOTAL'] == 0:
+        raise ValueError("at least one of wa, wc, wso must be non-zero")
+
+    a, c, s = components
+    total = (weights['wa'] * a + weights['wc'] * c + weights['wso'] * s) / weights['W_TOTAL']
+    return total, a, c, s
+
+
+def score_programs(matrix, answers):
+    """Academic, campus, social and overall score arrays for normalized answers."""
+    if answers['W_TOTAL'] == 0:
+        raise ValueError("at least one of wa, wc, wso must be non-zero")
+    return weigh_components(component_scores(matrix, answers), answers)
+
+
+# Users scored together in one block of score_programs_batch. Small blocks
+# keep each (users × programs) temporary in cache; larger ones get slower
+BATCH_BLOCK = 32
+
+
+def _column(answers_list, key, dtype=np.float64):
+    return np.array([answers[key] for answers in answers_list], dtype=dtype)[:, None]
+
+
+def _list_lengths(answers_list, key):
+    return np.array([max(len(answers[key]), 1) for answers in answers_list], dtype=np.int64)[:, None]
+
+
+def _row_flags(answers_list, test):
+    return np.array([test(answers) for answers in answers_list], dtype=bool)[:, None]
+
+
+def academic_scores_batch(matrix, answers_list):
+    """academic_scores for every answer set: a (users × programs) array."""
+    i_score = INTEREST_SCORES[np.minimum(matrix.interests.match_counts_each([a['AA'] for a in answers_list]), 3)] * 0.4
+
+    ratio = matrix.courses.match_counts_each([a['LC'] for a in answers_list]) / _list_lengths(answers_list, 'LC')
+    lc_score = np.minimum(ratio, 1.0) * 0.2
+
+    alt_score = (matrix.alt.count_common_each([set(a['ALT']) for a in answers_list]) / _list_lengths(answers_list, 'ALT')) * 0.1
+
+    weight_rows = [academic_weights(answers) for answers in answers_list]
+    weights = np.array([w for w, _ in weight_rows], dtype=np.float64)
+    total_weight = np.array([t for _, t in weight_rows], dtype=np.float64)[:, None]
+    num_sum = 0
+    for k, (column, key) in enumerate(zip(matrix.academic, ACADEMIC_ANSWERS)):
+        num_sum = num_sum + (1 - (np.abs(column[None, :] - _column(answers_list, key, np.int64)) / 4.0)) * weights[:, k:k + 1]
+    num_score = num_sum / total_weight * 0.3
+
+    # Users without interests/courses/alts get exact zeros here, as the
+    # single-user path's literal 0 terms
+    return i_score + lc_score + num_score + alt_score
+
+
+def campus_scores_batch(matrix, answers_list):
+    """campus_scores for every answer set: a (users × programs) array."""
+    class_size = np.where(matrix.class_size.equals_each([a['CSB'] for a in answers_list]), 1.0, 0.0)
+    partial = _row_flags(answers_list, lambda a: a['CSB'] in ("< 60", "200+")) & matrix.class_size.equals("60-200")[None, :]
+    class_size[partial] = 0.5
+
+    setting = np.where(matrix.setting.equals_each([a['SET'] for a in answers_list]), 1.0, 0.0)
+    for related in (URBAN_SUBURBAN, RURAL_SMALL):
+        rows = _row_flags(answers_list, lambda a: a['SET'] in related)
+        setting[(setting == 0.0) & rows & matrix.setting.isin(related)[None, :]] = 0.5
+
+    has_housing = _row_flags(answers_list, lambda a: bool(a['HS']))
+    shared = matrix.housing.count_common_each([a['HS'] for a in answers_list]) / _list_lengths(answers_list, 'HS')
+    housing = np.where(has_housing & matrix.housing.nonempty[None, :], shared, 0.0)
+
+    campus_size = np.where(matrix.campus_size.equals_each([a['CPS'] for a in answers_list]), 1.0, 0.0)
+    rank = np.array([CAMPUS_SIZES.index(a['CPS']) if a['CPS'] in CAMPUS_SIZES else -9 for a in answers_list])[:, None]
+    near = (rank != -9) & (matrix.campus_size_rank[None, :] != -1) & (np.abs(matrix.campus_size_rank[None, :] - rank) == 1)
+    campus_size[(campus_size == 0.0) & near] = 0.5
+
+    return (class_size + setting + housing + campus_size) / 4
+
+
+def social_scores_batch(matrix, answers_list):
+    """social_scores for every answer set: a (users × programs) array."""
+    ns_score = 1 - (np.abs(matrix.night_scene[None, :] - _column(answers_list, 'NS', np.int64)) / 4.0)
+
+    no_sports = _row_flags(answers_list, lambda a: "None" in a['SPT'])
+    spt_score = np.where(no_sports, 1.0, matrix.sports.count_common_each([a['SPT'] for a in answers_list]) / _list_lengths(answers_list, 'SPT'))
+
+    has_clubs = _row_flags(answers_list, lambda a: bool(a['CLB']))
+    cl_score = np.where(has_clubs, matrix.clubs.count_common_each([a['CLB'] for a in answers_list]) / _list_lengths(answers_list, 'CLB'), 0.5)
+
+    cev_score = 1 - (np.abs(matrix.cultural_event_freq[None, :] - _column(answers_list, 'CEV', np.int64)) / 4.0)
+
+    return (ns_score + spt_score + cl_score + cev_score) / 4
+
+
+def score_programs_batch(matrix, answers_list):
+    """
+    score_programs for many normalized answer sets in one pass. Returns
+    (total, a, c, s) as (users × programs) arrays whose rows are identical
+    to score_programs on each answer set alone.
+    """
+    for answers in answers_list:
+        if answers['W_TOTAL'] == 0:
+            raise ValueError("at least one of wa, wc, wso must be non-zero")
+
+    shape = (len(answers_list), matrix.size)
+    total, a, c, s = (np.empty(shape) for _ in range(4))
+    for start in range(0, len(answers_list), BATCH_BLOCK):
+        block = answers_list[start:start + BATCH_BLOCK]
+        rows = slice(start, start + len(block))
+        a[rows] = academic_scores_batch(matrix, block)
+        c[rows] = campus_scores_batch(matrix, block)
+        s[rows] = social_scores_batch(matrix, block)
+        total[rows] = ((_column(block, 'wa') * a[rows] + _column(block, 'wc') * c[rows] + _column(block, 'wso') * s[rows])
+                       / _column(block, 'W_TOTAL'))
+    return total, a, c, s
+
+
+def top_k(total, k):
+    """
+    Indices of the k highest totals, best first. Ties keep program order, the
+    same as a stable descending sort, but only the programs scoring at least
+    the k-th best total are sorted.
+    """
+    k = max(k, 0)
+    if k >= len(total):
+        return np.argsort(-total, kind='stable')
+
+    neg = -total
+    kth = np.partition(neg, k - 1)[k - 1] if k else -np.inf
+    candidates = np.flatnonzero(neg <= kth)
+    return candidates[np.argsort(neg[candidates], kind='stable')][:k]
+
+
+def match_rows(matrix, scores, indices):
+    """Result dicts for the programs at indices, in that order."""
+    total, a, c, s = scores
+    return [
+        {
+            "school": matrix.schools[i],
+            "program": matrix.programs[i],
+            "overall": float(total[i]),
+            "academic": float(a[i]),
+            "campus": float(c[i]),
+            "social": float(s[i]),
+        }
+        for i in indices
+    ]
+
+
+def top_matches(matrix, scores, num_results=10, offset=0):
+    """
+    Result dicts for the num_results best programs in score_programs output,
+    skipping the first offset. Pages line up exactly: top_k(k) is always a
+    prefix of top_k(k + n).
+    """
+    return match_rows(matrix, scores, top_k(scores[0], offset + num_results)[offset:])
+
+
+def compute_matches(matrix, answers, num_results=10):
+    """Top num_results programs for raw quiz answers, best first."""
+    return top_matches(matrix, score_programs(matrix, normalize_answers(answers)), num_results)
@@ -7,30 +7,17 @@ and then ranks the top 10 university programs from program_profiles.json
 based on their responses.
 
 Usage:
-    pip3 install tqdm
     python3 quiz_cli.py
 
 Outputs the top 10 matches with scores.
 """
 import json
-from tqdm import tqdm
-import sys
 import datetime
+import math
 from io import BytesIO
-from reportlab.lib.pagesizes import letter, landscape
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
 import os
 
-# Load program profiles
-try:
-    with open('program_profiles.json', 'r', encoding='utf-8') as f:
-        programs = json.load(f)
-except FileNotFoundError:
-    print("Error: program_profiles.json not found. Make sure it exists in this folder.")
-    sys.exit(1)
+PROGRAMS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'program_profiles.json')
 
 # Interest mappings - standardized categories for better matching
 INTEREST_MAPPINGS = {
@@ -162,28 +149,83 @@ INTEREST_DESCRIPTIONS = {
     "Undecided": "Not sure yet or interested in multiple areas"
 }
 
+# Program terms resolved against the mappings: term -> (lowercased term,
+# mapped categories in first-match order). Filled for every program at load
+# time so scoring never rescans the mapping keys.
+INTEREST_CATEGORIES = {}
+COURSE_CATEGORIES = {}
+
+def resolve_term(term, mappings, resolved):
+    """Lowercased term and the categories of the mapping keys it contains."""
+    entry = resolved.get(term)
+    if entry is None:
+        lower = term.lower()
+        categories = tuple(dict.fromkeys(mappings[key] for key in mappings if key in lower))
+        entry = resolved[term] = (lower, categories)
+    return entry
+
+def precompile_program_terms(programs):
+    """Resolve every program interest and liked course once."""
+    for p in programs:
+        for interest in p['academic']['interests']:
+            resolve_term(interest, INTEREST_MAPPINGS, INTEREST_CATEGORIES)
+        for course in p['academic'].get('liked_hs_courses', []):
+            resolve_term(course, COURSE_MAPPINGS, COURSE_CATEGORIES)
+
+# Program profiles are loaded on first use, not at import time
+_programs = None
+
+def load_programs(path=PROGRAMS_PATH):
+    """Parse a program profiles file and resolve its interest/course terms."""
+    with open(path, 'r', encoding='utf-8') as f:
+        programs = json.load(f)
+    precompile_program_terms(programs)
+    return programs
+
+def get_programs():
+    """The profiles from program_profiles.json next to this module, loaded once."""
+    global _programs
+    if _programs is None:
+        _programs = load_programs()
+    return _programs
+
+def __getattr__(name):
+    # Keeps `match_me.programs` working without loading the file at import
+    if name == 'programs':
+        return get_programs()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _mapped_terms(user_terms, program_terms, mappings, resolved):
+    """
+    Distinct matches between a program's terms and the user's picks: a term
+    the user picked directly counts as itself, otherwise the first of its
+    mapped categories the user picked counts.
+    """
+    user_lower = {t.lower() for t in user_terms}
+    user_set = set(user_terms)
+
+    matched = set()
+    for term in program_terms:
+        lower, categories = resolve_term(term, mappings, resolved)
+        # Direct match first
+        if lower in user_lower:
+            matched.add(lower)
+            continue
+
+        # Try mapped categories
+        for category in categories:
+            if category in user_set:
+                matched.add(category)
+                break
+    return matched
+
 # Enhanced interest matching using mappings
 def enhanced_interest_score(user_interests, program_interests):
     """Calculate interest score with mapping to standardized categories"""
     if not user_interests:
         return 0
-        
-    mapped_program_interests = set()
-    for interest in program_interests:
-        # Convert to lowercase for matching
-        interest_lower = interest.lower()
-        # Direct match first
-        if interest_lower in [i.lower() for i in user_interests]:
-            mapped_program_interests.add(interest_lower)
-            continue
-            
-        # Try mapped categories
-        for key_term in INTEREST_MAPPINGS:
-            if key_term in interest_lower:
-                category = INTEREST_MAPPINGS[key_term]
-                if category in user_interests:
-                    mapped_program_interests.add(category)
-                    break
+
+    mapped_program_interests = _mapped_terms(user_interests, program_interests, INTEREST_MAPPINGS, INTEREST_CATEGORIES)
     
     # Calculate match score with bonus for multiple matches
     match_count = len(mapped_program_interests)
@@ -201,29 +243,46 @@ def enhanced_course_score(user_courses, program_courses):
     """Calculate course match score with improved mapping"""
     if not user_courses or not program_courses:
         return 0
-        
-    mapped_program_courses = set()
-    for course in program_courses:
-        # Convert to lowercase for matching
-        course_lower = course.lower()
-        # Direct match first
-        if course_lower in [c.lower() for c in user_courses]:
-            mapped_program_courses.add(course_lower)
-            continue
-            
-        # Try mapped categories
-        for key_term in COURSE_MAPPINGS:
-            if key_term in course_lower:
-                category = COURSE_MAPPINGS[key_term]
-                if category in user_courses:
-                    mapped_program_courses.add(category)
-                    break
+
+    mapped_program_courses = _mapped_terms(user_courses, program_courses, COURSE_MAPPINGS, COURSE_CATEGORIES)
     
     match_ratio = len(mapped_program_courses) / max(len(user_courses), 1)
     return min(match_ratio, 1.0)  # Cap at 1.0
 
 # Scoring functions
-from math import fabs
+#
+# These score one program at a time and are the reference the vectorized
+# engine in match_engine.py is checked against (see
+# benchmarks/check_parity.py). Ranking itself goes through match_engine.
+
+ACADEMIC_KEYS = ['learning_style', 'first_year_specialization', 'coop_importance', 
+                 'research_importance', 'creativity_orientation', 'career_certainty', 
+                 'math_enjoyment', 'collaboration_preference']
+ACADEMIC_ANSWERS = ['LS', 'SP', 'CO', 'UR', 'CR', 'CE', 'ME', 'CP']
+
+def _academic_weights(co_high, ur_high, cr_high):
+    # Adjust weight based on importance
+    weights = {
+        'learning_style': 1.2,
+        'first_year_specialization': 1.0,
+        'coop_importance': 1.5 if co_high else 1.0,  # Boost if user cares about co-op
+        'research_importance': 1.5 if ur_high else 1.0,  # Boost if user cares about research
+        'creativity_orientation': 1.2 if cr_high else 1.0,
+        'career_certainty': 1.0,
+        'math_enjoyment': 1.3,  # Math is important for many programs
+        'collaboration_preference': 1.0
+    }
+    return tuple(weights[k] for k in ACADEMIC_KEYS), sum(weights.values())
+
+# (weights in ACADEMIC_KEYS order, total weight) for every combination of the
+# answers that change them, built once instead of per program
+ACADEMIC_WEIGHT_TABLE = {
+    (co, ur, cr): _academic_weights(co, ur, cr)
+    for co in (False, True) for ur in (False, True) for cr in (False, True)
+}
+
+def academic_weights(user_answers):
+    return ACADEMIC_WEIGHT_TABLE[(user_answers['CO'] >= 4, user_answers['UR'] >= 4, user_answers['CR'] >= 4)]
 
 def score_academic(p, user_answers):
     # interests (weighted 40%)
@@ -242,34 +301,14 @@ def score_academic(p, user_answers):
         alt_score = (len(matched_alts) / max(len(user_answers['ALT']), 1)) * 0.1
     
     # numeric (weighted 30%)
-    keys = ['learning_style', 'first_year_specialization', 'coop_importance', 
-            'research_importance', 'creativity_orientation', 'career_certainty', 
-            'math_enjoyment', 'collaboration_preference']
-    vals = [user_answers['LS'], user_answers['SP'], user_answers['CO'], user_answers['UR'], user_answers['CR'], user_answers['CE'], user_answers['ME'], user_answers['CP']]
-    
-    # Adjust weight based on importance
-    weights = {
-        'learning_style': 1.2,
-        'first_year_specialization': 1.0,
-        'coop_importance': 1.5 if user_answers['CO'] >= 4 else 1.0,  # Boost if user cares about co-op
-        'research_importance': 1.5 if user_answers['UR'] >= 4 else 1.0,  # Boost if user cares about research
-        'creativity_orientation': 1.2 if user_answers['CR'] >= 4 else 1.0,
-        'career_certainty': 1.0,
-        'math_enjoyment': 1.3,  # Math is important for many programs
-        'collaboration_preference': 1.0
-    }
-    
-    total_weight = sum(weights.values())
+    weights, total_weight = academic_weights(user_answers)
     
     num_scores = []
-    weight_sum = 0
-    for k, s, i in zip(keys, vals, range(len(keys))):
+    for k, answer, weight in zip(ACADEMIC_KEYS, ACADEMIC_ANSWERS, weights):
         prog_val = p['academic'].get(k, 3)
         # Closer values should score higher (5 point scale, max difference is 4)
-        similarity = 1 - (abs(prog_val - s) / 4.0)
-        weight = weights[k]
+        similarity = 1 - (abs(prog_val - user_answers[answer]) / 4.0)
         num_scores.append(similarity * weight)
-        weight_sum += weight
         
     # Normalize by weights
     num_score = sum(num_scores) / total_weight * 0.3
@@ -364,45 +403,23 @@ def score_social(p, user_answers):
     # Average all scores with equal weighting
     return (ns_score + spt_score + cl_score + cev_score) / 4
 
-# Add these imports at the top of the file
-import datetime
-from io import BytesIO
-from reportlab.lib.pagesizes import letter, landscape
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-import os
+# reportlab styles and the static part of the table style, built once per process
+_pdf_template = None
 
-def generate_matches_pdf_bytes(results, weights=None):
+def get_pdf_template():
     """
-    Generate a PDF with the top 100 program matches and return as bytes
-    for browser download.
-    
-    Args:
-        results: List of tuples (total_score, academic_score, campus_score, social_score, university, program)
-        weights: Optional dictionary with weights {'wa': academic_weight, 'wc': campus_weight, 'wso': social_weight}
-    
-    Returns:
-        BytesIO object containing the PDF data
+    Stylesheet, cell paragraph styles and base table commands for the
+    matches PDF. getSampleStyleSheet() and the ParagraphStyle objects cost
+    more than laying out a small table, so they are built on first use and
+    shared by every later call in this process.
     """
-    # Set default weights if not provided
-    if weights is None:
-        weights = {'wa': 0.6, 'wc': 0.2, 'wso': 0.2}
-    
-    # Create a BytesIO buffer instead of file
-    buffer = BytesIO()
-    
-    # Create PDF - Switch to landscape orientation
-    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=30, leftMargin=30, 
-                           topMargin=30, bottomMargin=18)
-    
-    # Rotate the page to landscape orientation
-    doc.pagesize = landscape(letter)
-    
-    # Take top 100 or all results if less than 100
-    top_programs = results[:min(100, len(results))]
-    
+    global _pdf_template
+    if _pdf_template is not None:
+        return _pdf_template
+
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
     styles = getSampleStyleSheet()
     
     styles['Title'].alignment = 1  # Center
@@ -430,6 +447,114 @@ def generate_matches_pdf_bytes(results, weights=None):
         leading=10,
         alignment=0,  # Left alignment
     )
+
+    # Define basic style first
+    table_style = (
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        # Make rank column centered
+        ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+        # Make university column left-aligned
+        ('ALIGN', (1, 1), (1, -1), 'LEFT'),
+        # Program column already left-aligned by the Paragraph style
+        # Make numeric columns right-aligned
+        ('ALIGN', (3, 1), (-1, -1), 'RIGHT'),
+        # Vertical alignment
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        # Add padding to cells
+        ('TOPPADDING', (0, 0), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+        ('LEFTPADDING', (0, 0), (-1, -1), 6),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+    )
+
+    _pdf_template = {
+        "styles": styles,
+        "program_style": program_style,
+        "university_style": university_style,
+        "table_style": table_style,
+        "header": ("Rank", "University", "Program", "Academic", "Campus", "Social", "Total"),
+        "col_widths": (30, 110, 200, 60, 60, 60, 60),
+        "stripe": colors.lightgrey,
+        "highlight": colors.palegreen,
+    }
+    return _pdf_template
+
+HIGHLIGHT_THRESHOLD = 0.7
+
+def _display_cutoff(threshold, places=3):
+    """
+    Largest float that still prints as threshold at the given decimals, so
+    `score > cutoff` decides exactly like comparing the printed value.
+    """
+    shown = f"{threshold:.{places}f}"
+    cutoff = threshold + 0.5 * 10 ** -places
+    while f"{cutoff:.{places}f}" != shown:
+        cutoff = math.nextafter(cutoff, -math.inf)
+    while f"{math.nextafter(cutoff, math.inf):.{places}f}" == shown:
+        cutoff = math.nextafter(cutoff, math.inf)
+    return cutoff
+
+# Scores are printed with 3 decimals; a cell is highlighted when the printed
+# value is above the threshold (0.7004 shows as 0.700 and is not)
+HIGHLIGHT_CUTOFF = _display_cutoff(HIGHLIGHT_THRESHOLD)
+
+def pdf_rows(results):
+    """
+    Yield (total, academic, campus, social, university, program) for each
+    result. Accepts the 6-tuples built by the CLI and frontend as well as the
+    dicts returned by the API (school, program, overall, academic, campus,
+    social).
+    """
+    for result in results:
+        if isinstance(result, dict):
+            yield (result['overall'], result['academic'], result['campus'],
+                   result['social'], result['school'], result['program'])
+        else:
+            yield result
+
+def generate_matches_pdf_bytes(results, weights=None, max_rows=100):
+    """
+    Generate a PDF with the top 100 program matches and return as bytes
+    for browser download.
+    
+    Args:
+        results: Ranked matches, either tuples (total_score, academic_score, campus_score, social_score, university, program)
+                 or the dicts returned by the API (see pdf_rows)
+        weights: Optional dictionary with weights {'wa': academic_weight, 'wc': campus_weight, 'wso': social_weight}
+        max_rows: Number of matches to include; None includes all of them
+    
+    Returns:
+        BytesIO object containing the PDF data
+    """
+    # reportlab is only needed here, so it is imported on first use
+    from reportlab.lib.pagesizes import letter, landscape
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.units import inch
+
+    template = get_pdf_template()
+    styles = template["styles"]
+
+    # Set default weights if not provided
+    if weights is None:
+        weights = {'wa': 0.6, 'wc': 0.2, 'wso': 0.2}
+    
+    # Create a BytesIO buffer instead of file
+    buffer = BytesIO()
+    
+    # Create PDF - Switch to landscape orientation
+    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=30, leftMargin=30, 
+                           topMargin=30, bottomMargin=18)
+    
+    # Rotate the page to landscape orientation
+    doc.pagesize = landscape(letter)
+    
+    # Take top max_rows (100 by default) or all results if fewer
+    top_programs = results if max_rows is None else results[:max_rows]
     
     # Build content
     content = []
@@ -450,15 +575,21 @@ def generate_matches_pdf_bytes(results, weights=None):
     content.append(Spacer(1, 0.1*inch))
     
     # Table data with wrapping program text
-    table_data = [["Rank", "University", "Program", "Academic", "Campus", "Social", "Total"]]
+    table_data = [list(template["header"])]
+    university_style = template["university_style"]
+    program_style = template["program_style"]
+    
+    style = list(template["table_style"])
+    highlight = template["highlight"]
+    highlights = []
     
-    for i, (tot, a, c, soc, uni, prog) in enumerate(top_programs):
+    for row, (tot, a, c, soc, uni, prog) in enumerate(pdf_rows(top_programs), start=1):
         # Convert the program name to a Paragraph object for wrapping
         university_cell = Paragraph(uni, university_style)
         program_cell = Paragraph(prog, program_style)
         
         table_data.append([
-            str(i+1),
+            str(row),
             university_cell,
             program_cell,  # Using Paragraph instead of string
             f"{a:.3f}",
@@ -466,63 +597,23 @@ def generate_matches_pdf_bytes(results, weights=None):
             f"{soc:.3f}",
             f"{tot:.3f}"
         ])
-    
-    # Create the table with column widths
-    col_widths = [30, 110, 200, 60, 60, 60, 60]  # Adjust column widths
-    table = Table(table_data, repeatRows=1, colWidths=col_widths)
-    
-    # Define basic style first
-    style = [
-        ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        # Make rank column centered
-        ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-        # Make university column left-aligned
-        ('ALIGN', (1, 1), (1, -1), 'LEFT'),
-        # Program column already left-aligned by the Paragraph style
-        # Make numeric columns right-aligned
-        ('ALIGN', (3, 1), (-1, -1), 'RIGHT'),
-        # Vertical alignment
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        # Add padding to cells
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-        ('LEFTPADDING', (0, 0), (-1, -1), 6),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-    ]
-    
-    # Add alternating row backgrounds
-    for row in range(1, len(table_data), 2):
-        style.append(('BACKGROUND', (0, row), (-1, row), colors.lightgrey))
-    
-    # Add conditional formatting for high scores
-    for row in range(1, len(table_data)):
-        # Academic score highlighting
-        try:
-            if float(table_data[row][3]) > 0.7:
-                style.append(('BACKGROUND', (3, row), (3, row), colors.palegreen))
-        except (ValueError, TypeError):
-            pass
         
-        # Campus score highlighting
-        try:
-            if float(table_data[row][4]) > 0.7:
-                style.append(('BACKGROUND', (4, row), (4, row), colors.palegreen))
-        except (ValueError, TypeError):
-            pass
+        # Add alternating row backgrounds
+        if row % 2:
+            style.append(('BACKGROUND', (0, row), (-1, row), template["stripe"]))
         
-        # Social score highlighting
-        try:
-            if float(table_data[row][5]) > 0.7:
-                style.append(('BACKGROUND', (5, row), (5, row), colors.palegreen))
-        except (ValueError, TypeError):
-            pass
-    
-    table.setStyle(TableStyle(style))
+        # Highlight high academic, campus and social scores
+        if a > HIGHLIGHT_CUTOFF:
+            highlights.append(('BACKGROUND', (3, row), (3, row), highlight))
+        if c > HIGHLIGHT_CUTOFF:
+            highlights.append(('BACKGROUND', (4, row), (4, row), highlight))
+        if soc > HIGHLIGHT_CUTOFF:
+            highlights.append(('BACKGROUND', (5, row), (5, row), highlight))
+    
+    # Create the table with column widths
+    table = Table(table_data, repeatRows=1, colWidths=list(template["col_widths"]))
+    # Highlights go after every stripe so they paint over them
+    table.setStyle(TableStyle(style + highlights))
     content.append(table)
     
     # Build the PDF
@@ -533,19 +624,24 @@ def generate_matches_pdf_bytes(results, weights=None):
     return buffer
 
 # Compute and rank
+_program_matrix = None
+
 def compute_matches(user_answers):
-    results = []
-    for p in tqdm(programs, desc="Scoring programs"):
-        try:
-            a = score_academic(p, user_answers)
-            c = score_campus(p, user_answers)
-            sos = score_social(p, user_answers)
-            total = (user_answers['wa']*a + user_answers['wc']*c + user_answers['wso']*sos) / (user_answers['W_TOTAL'] or 1)
-            results.append((total, a, c, sos, p['uni'], p['program']))
-        except Exception as e:
-            print(f"Error scoring {p.get('uni', 'Unknown')} - {p.get('program', 'Unknown')}: {e}")
-
-    results.sort(reverse=True, key=lambda x: x[0])
-    return results
-
-print("\nDone.")
+    """
+    Rank every program for CLI answers (sets for HS/SPT/CLB, W_TOTAL given)
+    using the shared vectorized engine. Returns (total, academic, campus,
+    social, university, program) tuples, best first.
+    """
+    global _program_matrix
+    import match_engine
+
+    programs = get_programs()
+    if _program_matrix is None:
+        _program_matrix = match_engine.ProgramMatrix(programs)
+
+    answers = dict(user_answers, W_TOTAL=user_answers['W_TOTAL'] or 1)
+    total, a, c, sos = match_engine.score_programs(_program_matrix, answers)
+    return [
+        (float(total[i]), float(a[i]), float(c[i]), float(sos[i]), programs[i]['uni'], programs[i]['program'])
+        for i in match_engine.top_k(total, len(programs))
+    ]
@@ -0,0 +1,88 @@
+"""
+Mentor roster from mentors.json, indexed for the program-mentors endpoints.
+"""
+import os
+import random
+
+from caches import LRUCache
+
+MENTORS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mentors.json')
+UNIVERSITY_CACHE_SIZE = 1024
+
+
+def normalize_university(name):
+    # Only lowercased, as the endpoint has always compared names; whitespace is significant
+    return name.lower()
+
+
+class MentorIndex:
+    """
+    Read-only view of mentors.json. Everything a lookup needs is computed
+    once here, so mentors_for() does dict lookups instead of scanning the
+    roster. Mentors always come back in roster order.
+    """
+
+    def __init__(self, data, mtime=None):
+        self.mtime = mtime
+        self.mentors = tuple(data.get("mentors", []))
+
+        positions = {}
+        for position, mentor in enumerate(self.mentors):
+            positions.setdefault(mentor["id"], []).append(position)
+        self.by_id = {mentor_id: self.mentors[found[0]] for mentor_id, found in positions.items()}
+
+        # program key -> its listed mentors (every roster entry with one of the ids)
+        self.by_program = {}
+        for key, mentor_ids in data.get("programMentors", {}).items():
+            found = sorted({position for mentor_id in mentor_ids for position in positions.get(mentor_id, ())})
+            self.by_program[key] = tuple(self.mentors[position] for position in found)
+
+        # lowercased school -> roster positions of its mentors
+        self.university_positions = {}
+        for position, mentor in enumerate(self.mentors):
+            self.university_positions.setdefault(normalize_university(mentor["school"]), []).append(position)
+        self._university_cache = LRUCache(UNIVERSITY_CACHE_SIZE)
+
+    def university_mentors(self, university):
+        """
+        Mentors whose school contains university (case-insensitive), as the
+        endpoint has always matched. The distinct school names are scanned
+        once per query string and the answer is kept in an LRU cache.
+        """
+        name = normalize_university(university)
+        mentors = self._university_cache.get(name)
+        if mentors is None:
+            found = sorted(
+                position
+                for school, positions in self.university_positions.items() if name in school
+                for position in positions
+            )
+            mentors = tuple(self.mentors[position] for position in found)
+            self._university_cache.put(name, mentors)
+        return mentors
+
+    def mentors_for(self, program_key, rng=random):
+        """
+        Mentors to show for a "<university>_<program>" key: the program's own
+        mentors, else up to two from the same university, else two at random.
+        """
+        program_mentors = self.by_program.get(program_key)
+        if program_mentors:
+            return list(program_mentors)
+
+        university = program_key.split('_')[0]
+        if university:
+            university_mentors = self.university_mentors(university)
+            if university_mentors:
+                return list(university_mentors[:2])
+
+        return rng.sample(self.mentors, min(2, len(self.mentors)))
+
+
+def seeded_rng(seed, program_key):
+    """
+    Random source for one key of a seeded request. Mixing in the key keeps
+    each key's random picks the same no matter which batch it arrives in.
+    """
+    return random.Random(f"{seed}\0{program_key}")
+
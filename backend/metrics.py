@@ -0,0 +1,175 @@
+"""
+Lightweight request instrumentation for the API.
+
+Collects per-endpoint latency histograms, per-stage timings inside a
+request (parse / score / sort / serialize / pdf) and cache statistics, and
+renders them in the Prometheus text exposition format for /metrics. Debug
+logging of request details is sampled so it stays off the hot path.
+
+Metrics live in the process that recorded them; under gunicorn each worker
+reports its own numbers.
+"""
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("unime.api")
+
+# Fraction of requests whose details are logged at DEBUG level
+DEBUG_SAMPLE_RATE = float(os.environ.get("DEBUG_SAMPLE_RATE", "0.01"))
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with one series per label combination."""
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Per-bucket counts (not cumulative), then sum and count
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def collect(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(labels, list(series[0]), series[1], series[2]) for labels, series in self._series.items()]
+        for labels, counts, total, count in sorted(snapshot):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                label_text = _format_labels(self.labelnames + ("le",), labels + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{label_text} {cumulative}")
+            label_text = _format_labels(self.labelnames + ("le",), labels + ("+Inf",))
+            lines.append(f"{self.name}_bucket{label_text} {count}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+class CacheMetrics:
+    """
+    Gauges read from caches at scrape time. Each registered cache needs a
+    stats() method returning hits, misses, size and hit_ratio (LRUCache does).
+    """
+
+    def __init__(self):
+        self._caches = {}
+
+    def register(self, name, cache):
+        self._caches[name] = cache
+
+    def collect(self):
+        stats = {name: cache.stats() for name, cache in sorted(self._caches.items())}
+        families = (
+            ("cache_hits_total", "counter", "Cache lookups that found an entry", "hits"),
+            ("cache_misses_total", "counter", "Cache lookups that found nothing", "misses"),
+            ("cache_entries", "gauge", "Entries currently cached", "size"),
+            ("cache_hit_ratio", "gauge", "Hits divided by lookups since start", "hit_ratio"),
+        )
+        lines = []
+        for metric, kind, documentation, field in families:
+            lines.append(f"# HELP {metric} {documentation}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, values in stats.items():
+                lines.append(f"{metric}{_format_labels(('cache',), (name,))} {_format_value(values[field])}")
+        return lines
+
+
+request_latency = Histogram(
+    "http_request_duration_seconds", "Request latency by endpoint",
+    ("endpoint", "method", "status"))
+stage_latency = Histogram(
+    "request_stage_duration_seconds", "Time spent in each stage of a request",
+    ("endpoint", "stage"))
+caches = CacheMetrics()
+
+_current = threading.local()
+
+
+@contextmanager
+def stage(name):
+    """Time a block as one stage of the current request."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        endpoint = getattr(_current, "endpoint", None) or "none"
+        stage_latency.observe(time.perf_counter() - start, endpoint, name)
+
+
+def sampled():
+    """True for about DEBUG_SAMPLE_RATE of calls when debug logging is on."""
+    return logger.isEnabledFor(logging.DEBUG) and random.random() < DEBUG_SAMPLE_RATE
+
+
+def debug_sampled(message, *args):
+    """Log at DEBUG for a sample of calls; arguments are only formatted when logged."""
+    if sampled():
+        logger.debug(message, *args)
+
+
+def render():
+    """All metrics in Prometheus text format."""
+    lines = request_latency.collect() + stage_latency.collect() + caches.collect()
+    return "\n".join(lines) + "\n"
+
+
+def instrument_app(app):
+    """Time every request to app by endpoint, method and status."""
+    from flask import g, request
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_start = time.perf_counter()
+        _current.endpoint = request.endpoint
+
+    @app.after_request
+    def _record(response):
+        start = g.pop("metrics_start", None)
+        if start is not None:
+            request_latency.observe(time.perf_counter() - start, request.endpoint or "unmatched",
+                                    request.method, response.status_code)
+        return response
+
+    @app.teardown_request
+    def _clear(exc):
+        _current.endpoint = None
+
+    return app
@@ -0,0 +1,225 @@
+"""
+Background PDF generation for /api/download-pdf.
+
+PDFs are rendered in a process pool so a download never holds a request
+thread for the whole reportlab layout. Finished files are kept in a
+content-addressed cache directory: the job id is a hash of the results and
+weights, so resubmitting the same payload returns the existing job (or the
+finished file) instead of rendering again. The directory is shared by all
+gunicorn workers, so a job started by one worker can be fetched from another.
+A cached PDF keeps the "Generated:" time of its first render; identical
+results are served as that same file.
+
+The directory defaults to backend/pdf_cache and can be moved with the
+PDF_CACHE_DIR environment variable. If it can't be written, synchronous
+downloads are rendered in memory instead (async jobs need the directory).
+
+Each job moves through files named after its id:
+    <id>.pending   rendering (written when the job is submitted)
+    <id>.pdf       finished
+    <id>.error     failed; holds the error message
+"""
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger("unime.pdf")
+
+PDF_CACHE_DIR = os.environ.get(
+    "PDF_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pdf_cache'))
+MAX_CACHED_PDFS = 500
+# Render processes per gunicorn worker; there are already several workers per core
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", "1"))
+# A .pending marker older than this belongs to a worker that died mid-job
+PENDING_TIMEOUT = 120
+
+
+def payload_key(results, weights):
+    """Job id for a results/weights payload; identical payloads share it."""
+    canonical = json.dumps([results, weights], sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+def is_job_id(key):
+    """Job ids are sha1 hex digests; anything else never names a cache file."""
+    return len(key) == 40 and all(ch in '0123456789abcdef' for ch in key)
+
+
+def _write_atomic(path, data):
+    tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def render_pdf(path, results, weights):
+    """Render the matches PDF to path. Runs inside a pool process."""
+    from match_me import generate_matches_pdf_bytes
+    buffer = generate_matches_pdf_bytes(results, weights)
+    _write_atomic(path, buffer.getvalue())
+    return path
+
+
+class PDFJobs:
+    """
+    Submits PDF renders to a process pool and tracks them through the cache
+    directory. The pool is created on first use, so it is started inside
+    each gunicorn worker rather than inherited from the preloading master.
+    """
+
+    def __init__(self, cache_dir=PDF_CACHE_DIR, max_workers=PDF_WORKERS, max_cached=MAX_CACHED_PDFS):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.max_cached = max_cached
+        self._pool = None
+        self._futures = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key, suffix):
+        return os.path.join(self.cache_dir, f"{key}.{suffix}")
+
+    def _executor(self):
+        if self._pool is None:
+            # Children come from a clean forkserver process rather than being
+            # forked from this one, which is already running other threads
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("forkserver"))
+        return self._pool
+
+    def _submit_render(self, key, results, weights):
+        """
+        Hand the render to the pool. A pool child that died (e.g. OOM-killed)
+        leaves the pool broken for good, so it is replaced and tried once more.
+        """
+        try:
+            return self._executor().submit(render_pdf, self._path(key, 'pdf'), results, weights)
+        except BrokenProcessPool:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+            return self._executor().submit(render_pdf, self._path(key, 'pdf'), results, weights)
+
+    def submit(self, results, weights):
+        """Start rendering unless this payload is already cached or running; returns the job id."""
+        key = payload_key(results, weights)
+        with self._lock:
+            if key in self._futures or self.status(key) in ("done", "pending"):
+                self.hits += 1
+                return key
+            self.misses += 1
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._remove(self._path(key, 'error'))
+            future = self._submit_render(key, results, weights)
+            # Only marked pending once the pool has accepted the job
+            _write_atomic(self._path(key, 'pending'), b'')
+            self._futures[key] = future
+        future.add_done_callback(lambda f: self._finished(key, f))
+        return key
+
+    def render(self, results, weights):
+        """
+        The PDF for this payload, rendered in the calling thread on a cache
+        miss: the cached file's path, or a BytesIO when the cache directory
+        can't be written (e.g. a read-only deploy).
+        """
+        from match_me import generate_matches_pdf_bytes
+        key = payload_key(results, weights)
+        path = self._path(key, 'pdf')
+        if os.path.exists(path):
+            self.hits += 1
+            return path
+
+        self.misses += 1
+        buffer = generate_matches_pdf_bytes(results, weights)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            _write_atomic(path, buffer.getvalue())
+        except OSError as e:
+            logger.warning("Could not cache PDF: %s", e)
+            buffer.seek(0)
+            return buffer
+        self._prune()
+        return path
+
+    def _finished(self, key, future):
+        with self._lock:
+            self._futures.pop(key, None)
+        error = future.exception()
+        if error is not None:
+            try:
+                _write_atomic(self._path(key, 'error'), str(error).encode('utf-8'))
+            except OSError:
+                pass
+        self._remove(self._path(key, 'pending'))
+        self._prune()
+
+    def status(self, key):
+        """'done', 'pending', 'failed' or None for an unknown (or expired) job id."""
+        if os.path.exists(self._path(key, 'pdf')):
+            return "done"
+        if key in self._futures:
+            return "pending"
+        if os.path.exists(self._path(key, 'error')):
+            return "failed"
+        try:
+            started = os.path.getmtime(self._path(key, 'pending'))
+        except OSError:
+            return None
+        return "pending" if time.time() - started < PENDING_TIMEOUT else None
+
+    def pdf_path(self, key):
+        return self._path(key, 'pdf')
+
+    def error(self, key):
+        try:
+            with open(self._path(key, 'error'), 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def stats(self):
+        """Cache counters in the same shape as LRUCache.stats()."""
+        try:
+            size = sum(1 for entry in os.scandir(self.cache_dir) if entry.name.endswith('.pdf'))
+        except OSError:
+            size = 0
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "max_size": self.max_cached,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _prune(self):
+        """Drop the oldest cached files beyond max_cached."""
+        try:
+            entries = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(('.pdf', '.error'))]
+        except OSError:
+            return
+        if len(entries) <= self.max_cached:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_cached]:
+            self._remove(entry.path)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Compact binary snapshot of program_profiles.json.
+
+The compiled ProgramMatrix is written as one .npy file per array plus a
+meta.json holding the interned string tables. Workers load the arrays with
+np.load(mmap_mode='r'), so every process maps the same pages from the OS
+page cache instead of each parsing 1.5 MB of JSON into its own dicts.
+
+Each snapshot lives in a directory named after a checksum of the source
+JSON, the term mappings and the snapshot format. When any of them changes
+the checksum no longer matches and the snapshot is rebuilt on the next load.
+A new snapshot replaces only earlier ones built from the same source file,
+so processes loading different profile files can share the root.
+
+Usage:
+    python3 profile_snapshot.py [program_profiles.json]
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+
+import match_me
+from match_engine import ProgramMatrix
+
+SNAPSHOT_FORMAT = 1
+logger = logging.getLogger("unime.data")
+
+SNAPSHOT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'program_profiles.snapshot')
+
+
+def source_checksum(raw):
+    """Checksum of the profile bytes plus everything else the arrays depend on."""
+    digest = hashlib.sha1(raw)
+    digest.update(json.dumps([SNAPSHOT_FORMAT, match_me.INTEREST_MAPPINGS, match_me.COURSE_MAPPINGS]).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def snapshot_dir(checksum, root=SNAPSHOT_ROOT):
+    return os.path.join(root, checksum)
+
+
+def write_snapshot(matrix, checksum, root=SNAPSHOT_ROOT, source=None):
+    """
+    Write matrix under root/<checksum>, atomically; returns the directory.
+    source is the JSON path it was built from; older snapshots of the same
+    source are removed.
+    """
+    arrays, tables = matrix.dump()
+    os.makedirs(root, exist_ok=True)
+
+    tmp = tempfile.mkdtemp(prefix='.building-', dir=root)
+    try:
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp, f"{name}.npy"), np.ascontiguousarray(array), allow_pickle=False)
+        meta = {"format": SNAPSHOT_FORMAT, "checksum": checksum, "arrays": sorted(arrays), "tables": tables,
+                "source": _source_name(source)}
+        with open(os.path.join(tmp, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.rename(tmp, snapshot_dir(checksum, root))
+    except OSError:
+        # Another process published the same snapshot first
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not os.path.isdir(snapshot_dir(checksum, root)):
+            raise
+
+    _remove_stale(checksum, root, _source_name(source))
+    return snapshot_dir(checksum, root)
+
+
+def _source_name(source):
+    return os.path.abspath(source) if source else None
+
+
+def _snapshot_source(path):
+    try:
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+            return json.load(f).get("source")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _remove_stale(keep, root, source):
+    """Remove the snapshots of source other than keep; other sources' snapshots stay."""
+    if source is None:
+        return
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if name != keep and not name.startswith('.') and _snapshot_source(path) == source:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def read_snapshot(checksum, root=SNAPSHOT_ROOT):
+    """The memory-mapped matrix for checksum, or None if there is no valid snapshot."""
+    path = snapshot_dir(checksum, root)
+    try:
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get("format") != SNAPSHOT_FORMAT or meta.get("checksum") != checksum:
+            return None
+        arrays = {}
+        for name in meta["arrays"]:
+            mapped = np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')
+            # Plain ndarray view over the mapped file, so results are not memmaps
+            arrays[name] = np.asarray(mapped)
+    except (OSError, ValueError, KeyError):
+        return None
+    return ProgramMatrix.restore(arrays, meta["tables"], version=checksum[:12])
+
+
+def load_program_matrix(json_path=match_me.PROGRAMS_PATH, root=SNAPSHOT_ROOT):
+    """
+    ProgramMatrix for json_path, served from the snapshot when its checksum
+    matches and rebuilt from the JSON (and re-snapshotted) when it does not.
+    """
+    with open(json_path, 'rb') as f:
+        raw = f.read()
+    return program_matrix_from_bytes(raw, json_path, root)
+
+
+def program_matrix_from_bytes(raw, json_path=None, root=SNAPSHOT_ROOT):
+    """
+    ProgramMatrix for the profile JSON in raw, which was read from json_path.
+    Callers that already hold the bytes use this so the matrix is built from
+    exactly what they checksummed.
+    """
+    checksum = source_checksum(raw)
+
+    matrix = read_snapshot(checksum, root)
+    if matrix is not None:
+        return matrix
+
+    matrix = ProgramMatrix(json.loads(raw), version=checksum[:12])
+    try:
+        write_snapshot(matrix, checksum, root, source=json_path)
+    except OSError as e:
+        # A read-only deploy can still serve from the freshly compiled matrix
+        logger.warning("Could not write profile snapshot: %s", e)
+        return matrix
+    return read_snapshot(checksum, root) or matrix
+
+
+if __name__ == "__main__":
+    json_path = sys.argv[1] if len(sys.argv) > 1 else match_me.PROGRAMS_PATH
+    with open(json_path, 'rb') as f:
+        raw = f.read()
+    checksum = source_checksum(raw)
+    path = write_snapshot(ProgramMatrix(json.loads(raw)), checksum, source=json_path)
+    size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    print(f"Wrote {path} ({size / 1024:.0f} KB)")
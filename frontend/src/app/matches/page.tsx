@@ -90,52 +90,18 @@ export default function Matches() {
           // Get answers from localStorage
           const answers = JSON.parse(localStorage.getItem("answers") || "{}");
           
-          // Make a separate API call to get all 100 matches
-          const fullMatchesResponse = await fetch('http://localhost:5001/api/full-matches', {
-            method: 'POST',
-            headers: {
-              'Content-Type': 'application/json'
-            },
-            body: JSON.stringify(answers)
-          });
-          
-          if (!fullMatchesResponse.ok) {
-            throw new Error('Failed to fetch full matches data');
-          }
-          
-          const fullMatchesData = await fullMatchesResponse.json();
-          
-          // Format all 100 matches for the PDF
-          interface FullMatch {
-            overall: number;
-            academic: number;
-            campus: number;
-            social: number;
-            school: string;
-            program: string;
-          }
-
-          const allMatches: [number, number, number, number, string, string][] = fullMatchesData.matches.map((match: FullMatch) => [
-            match.overall,
-            match.academic,
-            match.campus, 
-            match.social,
-            match.school,
-            match.program
-          ]);
-          
-          // Download the PDF with all 100 matches
+          // The server ranks the answers itself (reusing the cached ranking)
+          // and builds the PDF with the top 100 matches
           const response = await fetch('http://localhost:5001/api/download-pdf', {
             method: 'POST',
             headers: {
               'Content-Type': 'application/json'
             },
             body: JSON.stringify({
-              results: allMatches,
+              answers: answers,
               weights: weights
             })
           });
-          
           // Rest of the function remains the same...
           if (!response.ok) {
             throw new Error('Failed to download PDF');